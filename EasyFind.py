@@ -20,4 +20,4 @@ from easyfind.store_strategies import StoreStrategies
 from easyfind.content_parser import ContentParser
 from easyfind.web_scraper import WebScraper
 from easyfind.data_manager import DataManager
-from easyfind.engine import main, procesar_tarea_segura
\ No newline at end of file
+from easyfind.engine import main
\ No newline at end of file
@@ -0,0 +1,78 @@
+"""
+Benchmark de motores de lectura Excel para catálogos de tiendas.
+
+Genera catálogos sintéticos (columnas Nombre / Link) de distintos tamaños y
+compara el tiempo de lectura de pandas con los motores openpyxl y calamine
+(este último solo si python-calamine está instalado).
+
+Uso:
+    python scripts/benchmark_excel.py
+    python scripts/benchmark_excel.py --filas 10000 100000 500000 --repeticiones 3
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+import pandas as pd
+from openpyxl import Workbook
+
+from easyfind.config import CALAMINE_DISPONIBLE
+
+
+PALABRAS = ['CABLE', 'UTP', 'CAT6', 'CAT6A', 'FIBRA', 'OPTICA', '24F', '48F', '305M',
+            'AZUL', 'GRIS', 'PATCH', 'CORD', 'ROSETA', 'RJ45', 'LC', 'SC', 'DUPLEX',
+            'MONOMODO', 'MULTIMODO', 'OM3', 'OS2', 'BANDEJA', 'ODF', '1U', '2U']
+
+
+def generar_catalogo(ruta: str, filas: int):
+    """Escribe un catálogo sintético de `filas` productos en `ruta`."""
+    rnd = random.Random(filas)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Productos")
+    ws.append(["Nombre", "Link"])
+    for i in range(filas):
+        nombre = " ".join(rnd.choice(PALABRAS) for _ in range(rnd.randint(3, 8)))
+        ws.append([nombre, f"https://tienda.cl/producto/{i}"])
+    wb.save(ruta)
+
+
+def medir(ruta: str, motor: str, repeticiones: int) -> float:
+    """Retorna el mejor tiempo (segundos) de lectura con el motor indicado."""
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        pd.read_excel(ruta, engine=motor)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara openpyxl vs calamine leyendo catálogos .xlsx")
+    parser.add_argument('--filas', type=int, nargs='+', default=[10_000, 100_000, 500_000])
+    parser.add_argument('--repeticiones', type=int, default=3)
+    args = parser.parse_args()
+
+    motores = ['openpyxl'] + (['calamine'] if CALAMINE_DISPONIBLE else [])
+    if not CALAMINE_DISPONIBLE:
+        print("python-calamine no instalado: solo se mide openpyxl (pip install python-calamine)")
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        print(f"{'Filas':>10} | " + " | ".join(f"{m:>10}" for m in motores) + " | Aceleración")
+        for filas in args.filas:
+            ruta = os.path.join(carpeta, f"Base_Datos_BENCH_{filas}.xlsx")
+            generar_catalogo(ruta, filas)
+            tiempos = {m: medir(ruta, m, args.repeticiones) for m in motores}
+            aceleracion = (f"{tiempos['openpyxl'] / tiempos['calamine']:.1f}x"
+                           if 'calamine' in tiempos else "-")
+            print(f"{filas:>10} | " + " | ".join(f"{tiempos[m]:>9.2f}s" for m in motores)
+                  + f" | {aceleracion}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Equivalencia y benchmark de los backends de parseo HTML (BeautifulSoup vs lxml).
+
+Para cada página guardada extrae (precio, marca) con ambos backends, verifica
+que el resultado sea idéntico y compara el tiempo de parseo + extracción.
+
+Las páginas se guardan como `<dominio>__<nombre>.html`; el dominio se usa
+para reconstruir la URL y elegir la estrategia de la tienda, por ejemplo:
+    paginas/www.dartel.cl__cable-utp-cat6.html
+    paginas/www.vitel.cl__patch-cord-2m.html
+
+Sin carpeta se usan páginas sintéticas que cubren cada estrategia.
+
+Uso:
+    python scripts/benchmark_parser.py
+    python scripts/benchmark_parser.py --paginas paginas/ --repeticiones 5
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from easyfind.config import LXML_CSS_DISPONIBLE
+from easyfind.content_parser import ContentParser
+
+
+RELLENO = '<div class="item"><a href="/p/{0}">Producto relacionado {0}</a><span>Ver más</span></div>'
+
+
+def _relleno(n: int = 3000) -> str:
+    return "".join(RELLENO.format(i) for i in range(n))
+
+
+PAGINAS_SINTETICAS = {
+    'www.dartel.cl__vtex-state': (
+        '<html><head><title>Cable</title></head><body>{relleno}'
+        '<template data-varname="__STATE__"><script>'
+        '{{"$Product:1.items.0.sellers.0.commertialOffer": {{"Price": 45990}}}}'
+        '</script></template></body></html>'
+    ),
+    'www.gobantes.cl__vtex': (
+        '<html><body>{relleno}<div class="skuBestPrice">$ 12.990</div>'
+        '<table><tr><th>Marca</th><td>Legrand</td></tr></table></body></html>'
+    ),
+    'www.vitel.cl__magento': (
+        '<html><body>{relleno}<div class="price-box"><span class="price">$23.490</span></div>'
+        '<meta itemprop="brand" content="Furukawa"></body></html>'
+    ),
+    'www.compratecno.cl__prestashop': (
+        '<html><body>{relleno}<div class="product-manufacturer"><meta itemprop="name" content="Panduit"></div>'
+        '<div class="current-price"><span itemprop="price" content="18990">$18.990</span></div></body></html>'
+    ),
+    'www.eecol.cl__json-ld': (
+        '<html><head><meta property="product:price:amount" content="9990">'
+        '<script type="application/ld+json">{{"@type": "Product", "brand": {{"name": "Schneider"}}}}</script>'
+        '</head><body>{relleno}</body></html>'
+    ),
+    'www.lk.cl__fabricante': (
+        '<html><head><meta property="og:title" content="LK - Cable. Nexans UTP"></head><body>{relleno}'
+        '<div class="pag_detalle" data-fab="7"></div><div class="barraFabricantes">'
+        '<a data-id="7" title="Nexans">Nexans</a></div><span class="precio-internet">$ 7.490</span></body></html>'
+    ),
+    'www.transworld.cl__marca': (
+        '<html><body>{relleno}<a href="/marcas/hikvision">Hikvision</a>'
+        '<span class="product-price">$ 55.000</span></body></html>'
+    ),
+    'www.intcomex.com__solo-marca': (
+        '<html><body>{relleno}<div class="marca"> Ubiquiti </div></body></html>'
+    ),
+    'www.generica.cl__texto-marca': (
+        '<html><body>{relleno}<dl><dt>Fabricante</dt><dd>3M</dd></dl>'
+        '<p class="price">Precio: <b>$ 3.290</b></p><!-- Marca oculta --></body></html>'
+    ),
+}
+
+
+def cargar_paginas(carpeta):
+    """Retorna [(url, html)] desde la carpeta o las páginas sintéticas."""
+    if not carpeta:
+        relleno = _relleno()
+        return [(f"https://{nombre.split('__')[0]}/{nombre.split('__')[1]}", plantilla.format(relleno=relleno))
+                for nombre, plantilla in PAGINAS_SINTETICAS.items()]
+    paginas = []
+    for ruta in sorted(glob.glob(os.path.join(carpeta, '*.html'))):
+        nombre = os.path.splitext(os.path.basename(ruta))[0]
+        dominio, _, resto = nombre.partition('__')
+        with open(ruta, encoding='utf-8', errors='replace') as f:
+            paginas.append((f"https://{dominio}/{resto}", f.read()))
+    return paginas
+
+
+def medir(html: str, url: str, backend: str, repeticiones: int):
+    """Retorna (resultado, mejor tiempo en segundos) para un backend."""
+    mejor = float('inf')
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = ContentParser.extraer_de_html(html, url, backend)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return resultado, mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara los backends bs4 y lxml sobre páginas guardadas")
+    parser.add_argument('--paginas', help="Carpeta con páginas <dominio>__<nombre>.html")
+    parser.add_argument('--repeticiones', type=int, default=3)
+    args = parser.parse_args()
+
+    if not LXML_CSS_DISPONIBLE:
+        print("lxml/cssselect no instalado: no hay backend rápido que comparar (pip install cssselect)")
+        return 1
+
+    paginas = cargar_paginas(args.paginas)
+    if not paginas:
+        print("No se encontraron páginas .html")
+        return 1
+
+    diferencias = 0
+    total = {'bs4': 0.0, 'lxml': 0.0}
+    print(f"{'Página':<45} | {'KB':>6} | {'bs4':>8} | {'lxml':>8} | Resultado")
+    for url, html in paginas:
+        res_bs4, t_bs4 = medir(html, url, 'bs4', args.repeticiones)
+        res_lxml, t_lxml = medir(html, url, 'lxml', args.repeticiones)
+        total['bs4'] += t_bs4
+        total['lxml'] += t_lxml
+        igual = res_bs4 == res_lxml
+        diferencias += not igual
+        detalle = f"{res_bs4}" if igual else f"DIFERENTE bs4={res_bs4} lxml={res_lxml}"
+        print(f"{url[8:][:45]:<45} | {len(html) / 1024:>6.0f} | {t_bs4 * 1000:>6.1f}ms | "
+              f"{t_lxml * 1000:>6.1f}ms | {detalle}")
+
+    n = len(paginas)
+    print(f"\nPromedio por página: bs4 {total['bs4'] / n * 1000:.1f} ms, lxml {total['lxml'] / n * 1000:.1f} ms "
+          f"({total['bs4'] / max(total['lxml'], 1e-9):.1f}x)")
+    print(f"Páginas con resultado distinto: {diferencias}/{n}")
+    return 1 if diferencias else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -16,4 +16,6 @@ from .store_strategies import StoreStrategies
 from .content_parser import ContentParser
 from .web_scraper import WebScraper
 from .data_manager import DataManager
-from .engine import main, procesar_tarea_segura
+from .engine import (main, scrapear_cola, ColaDominios, TareaScraping, RepartidorProcesos,
+                     trabajador_distribuido)
+from .cola_distribuida import ColaLeases, CoordinadorLeases
@@ -4,10 +4,12 @@ Entry point para ejecutar EasyFind como módulo: python -m easyfind
 Soporta:
   - Modo GUI normal (sin argumentos)
   - Modo dispatcher para PyInstaller (con argumento .py)
+  - Modo línea de comandos: python -m easyfind buscar|trabajador ... (ver cli.py)
 """
 
 import sys
 import runpy
+import multiprocessing
 
 # Importar bot_dependencies para forzar inclusión en PyInstaller
 from . import bot_dependencies  # noqa: F401
@@ -15,6 +17,9 @@ from . import bot_dependencies  # noqa: F401
 
 def main():
     """Punto de entrada principal de la aplicación."""
+    # Necesario para los pools de procesos en el ejecutable de PyInstaller
+    multiprocessing.freeze_support()
+    
     # --- LÓGICA DE DISPATCHER (Para ejecutar bots sin Python instalado) ---
     if len(sys.argv) > 1 and sys.argv[1].endswith('.py'):
         script_to_run = sys.argv[1]
@@ -31,6 +36,11 @@ def main():
         # si no hay terminal interactiva (caso PyInstaller --noconsole)
         sys.exit(1)
     
+    # --- LÍNEA DE COMANDOS (buscar / trabajador, sin GUI) ---
+    from . import cli
+    if len(sys.argv) > 1 and (sys.argv[1] in cli.COMANDOS or sys.argv[1] in ('-h', '--help')):
+        sys.exit(cli.main(sys.argv[1:]))
+    
     # --- INICIO NORMAL DE LA GUI ---
     import tkinter as tk
     from .gui.app import EasyFindApp
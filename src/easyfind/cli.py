@@ -0,0 +1,208 @@
+"""
+Interfaz de línea de comandos de EasyFind (sin GUI).
+
+Permite ejecutar búsquedas en servidores, programarlas o lanzar varias en
+paralelo, con rutas y parámetros por argumento en lugar de los valores fijos
+de la GUI. Desde la carpeta raíz del proyecto:
+
+    python App.py buscar --productos pedido.xlsx --salida pedido_resultado.csv
+    python App.py buscar --concurrencia 16 --umbral-alta 90 --json
+    python App.py trabajador --cola //servidor/easyfind/cola.sqlite
+
+`python -m easyfind ...` es equivalente con `src/` en el PYTHONPATH.
+
+Con `--json` el progreso se emite en stdout como una línea JSON por evento
+(`log`, `progreso`, `fin`) y los mensajes de texto del motor van a stderr.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Optional
+
+from .config import Config
+
+COMANDOS = ('buscar', 'trabajador')
+FORMATOS = ('xlsx', 'csv', 'json')
+
+# Código de salida cuando la búsqueda se detiene con Ctrl+C (se guarda lo avanzado)
+CODIGO_DETENIDO = 130
+
+
+def _crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="easyfind", description="EasyFind - comparación de precios sin GUI")
+    comandos = parser.add_subparsers(dest='comando', required=True)
+
+    buscar = comandos.add_parser('buscar', help="Buscar precios de un archivo de productos")
+    buscar.add_argument('--productos', help="Archivo de productos .xlsx o .csv (por defecto PRODUCTOS.xlsx)")
+    buscar.add_argument('--salida', help="Archivo de resultados (por defecto Resultado.<formato>)")
+    buscar.add_argument('--formato', choices=FORMATOS,
+                        help="Formato de salida (por defecto el de la extensión de --salida, o xlsx)")
+    buscar.add_argument('--tiendas', help=f"Carpeta de catálogos (por defecto {Config.CARPETA_TIENDAS}/)")
+    buscar.add_argument('--concurrencia', type=int, help=f"Pestañas simultáneas (Config: {Config.CONCURRENCIA_GLOBAL})")
+    buscar.add_argument('--concurrencia-tienda', type=int,
+                        help=f"Pestañas por tienda (Config: {Config.CONCURRENCIA_POR_TIENDA})")
+    buscar.add_argument('--procesos', type=int, help=f"Procesos de scraping (Config: {Config.PROCESOS_SCRAPING})")
+    buscar.add_argument('--umbral-alta', type=int, help=f"Similitud de alta precisión (Config: {Config.UMBRAL_ALTA_PRECISION})")
+    buscar.add_argument('--umbral-media', type=int, help=f"Similitud de media precisión (Config: {Config.UMBRAL_MEDIA_PRECISION})")
+    buscar.add_argument('--umbral-baja', type=int, help=f"Similitud mínima aceptable (Config: {Config.UMBRAL_BAJA_PRECISION})")
+    buscar.add_argument('--cola-distribuida', help="Coordinar trabajadores a través de este archivo SQLite")
+    buscar.add_argument('--reanudar', action='store_true', help="Reanudar desde la bitácora del mismo pedido")
+    buscar.add_argument('--forzar-actualizacion', action='store_true', help="Ignorar la caché de scraping")
+    buscar.add_argument('--json', action='store_true', help="Progreso como líneas JSON en stdout")
+
+    trabajador = comandos.add_parser('trabajador', help="Trabajador del modo distribuido")
+    trabajador.add_argument('--cola', required=True, help="Archivo SQLite compartido con el coordinador")
+    trabajador.add_argument('--nombre', help="Identificador del trabajador (por defecto host-PID)")
+    trabajador.add_argument('--concurrencia', type=int, help="Pestañas simultáneas de este trabajador")
+    return parser
+
+
+def _ruta_salida(args, parser) -> Optional[str]:
+    """Resuelve la ruta de salida a partir de --salida y --formato."""
+    if not args.salida:
+        if not args.formato:
+            return None
+        from .engine import carpeta_raiz
+        return os.path.join(carpeta_raiz(), f"Resultado.{args.formato}")
+    extension = os.path.splitext(args.salida)[1].lower().lstrip('.')
+    if not extension:
+        return args.salida + f".{args.formato or 'xlsx'}"
+    if extension not in FORMATOS:
+        parser.error(f"formato de salida no soportado: .{extension} (use {', '.join(FORMATOS)})")
+    if args.formato and args.formato != extension:
+        parser.error(f"--formato {args.formato} no coincide con la extensión de --salida ({args.salida})")
+    return args.salida
+
+
+def _validar_umbrales(args, parser):
+    """Exige alta >= media >= baja; los umbrales no indicados se toman de Config."""
+    alta = args.umbral_alta if args.umbral_alta is not None else Config.UMBRAL_ALTA_PRECISION
+    media = args.umbral_media if args.umbral_media is not None else Config.UMBRAL_MEDIA_PRECISION
+    baja = args.umbral_baja if args.umbral_baja is not None else Config.UMBRAL_BAJA_PRECISION
+    if not alta >= media >= baja:
+        parser.error(f"los umbrales deben cumplir alta >= media >= baja (alta {alta}, media {media}, baja {baja})")
+
+
+def _aplicar_config(args):
+    """Sobrescribe los parámetros de Config indicados por argumento."""
+    ajustes = {
+        'CONCURRENCIA_GLOBAL': args.concurrencia,
+        'CONCURRENCIA_POR_TIENDA': getattr(args, 'concurrencia_tienda', None),
+        'PROCESOS_SCRAPING': getattr(args, 'procesos', None),
+        'UMBRAL_ALTA_PRECISION': getattr(args, 'umbral_alta', None),
+        'UMBRAL_MEDIA_PRECISION': getattr(args, 'umbral_media', None),
+        'UMBRAL_BAJA_PRECISION': getattr(args, 'umbral_baja', None),
+        'COLA_DISTRIBUIDA': getattr(args, 'cola_distribuida', None),
+    }
+    if ajustes['COLA_DISTRIBUIDA']:
+        # Relativa al directorio actual, como --productos/--salida y `trabajador --cola`
+        ajustes['COLA_DISTRIBUIDA'] = os.path.abspath(ajustes['COLA_DISTRIBUIDA'])
+    for nombre, valor in ajustes.items():
+        if valor is not None:
+            setattr(Config, nombre, valor)
+
+
+class EmisorJSON:
+    """Escribe eventos de progreso como líneas JSON.
+
+    En el modo `--json` stdout queda reservado para los eventos: el
+    descriptor 1 se redirige a stderr (también para los procesos hijos) y
+    los eventos se escriben en una copia del stdout original.
+    """
+
+    def __init__(self):
+        sys.stdout.flush()
+        self._salida = os.fdopen(os.dup(1), 'w', encoding='utf-8', buffering=1)
+        os.dup2(2, 1)
+        self._lock = threading.Lock()
+
+    def emitir(self, evento: str, **datos):
+        linea = json.dumps({'evento': evento, 'tiempo': round(time.time(), 3), **datos}, ensure_ascii=False)
+        with self._lock:
+            self._salida.write(linea + "\n")
+
+    def log(self, mensaje):
+        self.emitir('log', mensaje=mensaje)
+
+    def progreso(self, actual, total):
+        self.emitir('progreso', actual=actual, total=total)
+
+
+def _buscar(args, parser) -> int:
+    from .engine import main as easyfind_main
+
+    ruta_resultado = _ruta_salida(args, parser)
+    _validar_umbrales(args, parser)
+    _aplicar_config(args)
+    emisor = EmisorJSON() if args.json else None
+
+    # Ctrl+C detiene la búsqueda de forma ordenada (se guarda lo avanzado); un segundo Ctrl+C la interrumpe
+    stop_event = threading.Event()
+
+    def detener(*_):
+        stop_event.set()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGINT, detener)
+
+    inicio = time.perf_counter()
+    try:
+        resultado = asyncio.run(easyfind_main(
+            callback_log=emisor.log if emisor else None,
+            callback_progress=emisor.progreso if emisor else None,
+            stop_event=stop_event,
+            reanudar=args.reanudar,
+            forzar_actualizacion=args.forzar_actualizacion,
+            ruta_productos=args.productos,
+            ruta_resultado=ruta_resultado,
+            carpeta_tiendas=args.tiendas,
+        ))
+    except KeyboardInterrupt:
+        # Segundo Ctrl+C: el motor ya cerró sus procesos y la cola distribuida
+        resultado = None
+
+    if stop_event.is_set():
+        codigo = CODIGO_DETENIDO
+    elif resultado is None:
+        codigo = 1
+    else:
+        codigo = 0
+    if emisor:
+        emisor.emitir('fin', codigo=codigo, resultado=resultado, segundos=round(time.perf_counter() - inicio, 2))
+    return codigo
+
+
+def _trabajador(args) -> int:
+    from .engine import trabajador_distribuido
+
+    _aplicar_config(args)
+    try:
+        asyncio.run(trabajador_distribuido(args.cola, args.nombre))
+    except KeyboardInterrupt:
+        return CODIGO_DETENIDO
+    return 0
+
+
+def main(argv=None) -> int:
+    """Punto de entrada de la CLI.
+
+    Args:
+        argv (list, optional): Argumentos (sin el nombre del programa). Por defecto sys.argv[1:].
+
+    Returns:
+        int: Código de salida (0 = terminado, 1 = error, 130 = detenido por el usuario).
+    """
+    parser = _crear_parser()
+    args = parser.parse_args(argv)
+    if args.comando == 'trabajador':
+        return _trabajador(args)
+    return _buscar(args, parser)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,275 @@
+"""
+Cola distribuida de scraping sobre un archivo SQLite compartido.
+
+El coordinador (`engine.main` con `Config.COLA_DISTRIBUIDA`) hace el matching
+y escribe una tarea por URL; los trabajadores (`engine.trabajador_distribuido`,
+en otros procesos o en otras máquinas con el archivo en una carpeta
+compartida) toman las tareas en leases, las scrapean y devuelven el
+resultado. El coordinador arma el Resultado.xlsx con lo que recibe.
+
+Los trabajadores envían un latido mientras corren; si un trabajador deja de
+latir por `Config.LEASE_EXPIRACION_S`, sus tareas sin resultado vuelven a
+quedar pendientes y las toma otro trabajador.
+"""
+
+import asyncio
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from typing import List, Optional, Tuple
+
+from .config import Config
+
+
+class ColaLeases:
+    """Acceso a la cola SQLite compartida (coordinador y trabajadores).
+
+    Tablas:
+        tareas: id, tienda, url, método, lease y trabajador asignado.
+        resultados: marca, precio y error por id de tarea (el primero gana).
+        trabajadores: último latido por trabajador.
+        estado: corrida actual y fase ('abierta' o 'terminada').
+
+    Attributes:
+        ruta (str): Ruta del archivo SQLite.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self._conexion = sqlite3.connect(ruta, timeout=30, isolation_level=None)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.executescript(
+            "CREATE TABLE IF NOT EXISTS tareas ("
+            " id INTEGER PRIMARY KEY, tienda TEXT, url TEXT, metodo TEXT,"
+            " lease INTEGER, trabajador TEXT);"
+            "CREATE TABLE IF NOT EXISTS resultados ("
+            " orden INTEGER PRIMARY KEY AUTOINCREMENT, id INTEGER UNIQUE,"
+            " marca TEXT, precio INTEGER, error TEXT, trabajador TEXT);"
+            "CREATE TABLE IF NOT EXISTS trabajadores (nombre TEXT PRIMARY KEY, latido REAL);"
+            "CREATE TABLE IF NOT EXISTS estado (clave TEXT PRIMARY KEY, valor TEXT);"
+        )
+
+    def _valor(self, clave: str) -> Optional[str]:
+        fila = self._conexion.execute("SELECT valor FROM estado WHERE clave = ?", (clave,)).fetchone()
+        return fila[0] if fila else None
+
+    def _fijar(self, clave: str, valor: str):
+        self._conexion.execute("INSERT OR REPLACE INTO estado (clave, valor) VALUES (?, ?)", (clave, valor))
+
+    # --- Coordinador ---
+
+    def reiniciar(self) -> str:
+        """Vacía la cola e inicia una corrida nueva. Retorna su identificador."""
+        corrida = uuid.uuid4().hex
+        self._conexion.execute("BEGIN IMMEDIATE")
+        for tabla in ('tareas', 'resultados', 'trabajadores', 'estado'):
+            self._conexion.execute(f"DELETE FROM {tabla}")
+        self._fijar('corrida', corrida)
+        self._fijar('fase', 'abierta')
+        self._fijar('ultimo_lease', '0')
+        self._conexion.execute("COMMIT")
+        return corrida
+
+    def agregar(self, tareas: List[Tuple[int, str, str, str]]):
+        """Agrega tareas (id, tienda, url, método) pendientes."""
+        self._conexion.executemany(
+            "INSERT INTO tareas (id, tienda, url, metodo) VALUES (?, ?, ?, ?)", tareas
+        )
+
+    def resultados_desde(self, ultimo_orden: int) -> List[Tuple[int, int, str, int, str]]:
+        """Retorna los resultados (orden, id, marca, precio, error) entregados después de `ultimo_orden`."""
+        return self._conexion.execute(
+            "SELECT orden, id, marca, precio, error FROM resultados WHERE orden > ? ORDER BY orden",
+            (ultimo_orden,)
+        ).fetchall()
+
+    def terminar(self):
+        """Marca la corrida como terminada; los trabajadores se detienen."""
+        self._fijar('fase', 'terminada')
+
+    # --- Trabajadores ---
+
+    def corrida_abierta(self) -> Optional[str]:
+        """Retorna el identificador de la corrida si está abierta, o None."""
+        return self._valor('corrida') if self._valor('fase') == 'abierta' else None
+
+    def latir(self, trabajador: str):
+        """Registra que el trabajador sigue vivo."""
+        self._conexion.execute(
+            "INSERT OR REPLACE INTO trabajadores (nombre, latido) VALUES (?, ?)", (trabajador, time.time())
+        )
+
+    def reasignar_vencidos(self) -> int:
+        """Libera las tareas sin resultado de trabajadores sin latido reciente.
+
+        Lo ejecuta el coordinador en cada sondeo.
+
+        Returns:
+            int: Tareas que volvieron a quedar pendientes.
+        """
+        limite = time.time() - Config.LEASE_EXPIRACION_S
+        cursor = self._conexion.execute(
+            "UPDATE tareas SET lease = NULL, trabajador = NULL"
+            " WHERE trabajador IN (SELECT nombre FROM trabajadores WHERE latido < ?)"
+            " AND id NOT IN (SELECT id FROM resultados)",
+            (limite,)
+        )
+        self._conexion.execute("DELETE FROM trabajadores WHERE latido < ?", (limite,))
+        return cursor.rowcount
+
+    def tomar_lease(self, trabajador: str, tamano: int) -> List[Tuple[int, str, str, str]]:
+        """Asigna al trabajador hasta `tamano` tareas pendientes (un lease).
+
+        Returns:
+            List[Tuple[int, str, str, str]]: (id, tienda, url, método) del lease.
+        """
+        self._conexion.execute("BEGIN IMMEDIATE")
+        try:
+            self.latir(trabajador)
+            lease = int(self._valor('ultimo_lease') or 0) + 1
+            self._fijar('ultimo_lease', str(lease))
+            self._conexion.execute(
+                "UPDATE tareas SET lease = ?, trabajador = ? WHERE id IN ("
+                " SELECT id FROM tareas WHERE trabajador IS NULL ORDER BY id LIMIT ?)",
+                (lease, trabajador, tamano)
+            )
+            tareas = self._conexion.execute(
+                "SELECT id, tienda, url, metodo FROM tareas WHERE lease = ? ORDER BY id", (lease,)
+            ).fetchall()
+            self._conexion.execute("COMMIT")
+        except BaseException:
+            self._conexion.execute("ROLLBACK")
+            raise
+        return tareas
+
+    def entregar(self, id_tarea: int, marca: str, precio: int, error: str, trabajador: str):
+        """Guarda el resultado de una tarea (si otro trabajador ya lo entregó, se ignora)."""
+        self._conexion.execute(
+            "INSERT OR IGNORE INTO resultados (id, marca, precio, error, trabajador) VALUES (?, ?, ?, ?, ?)",
+            (id_tarea, marca, int(precio), error, trabajador)
+        )
+
+    def liberar(self, trabajador: str):
+        """Devuelve a pendientes las tareas sin resultado del trabajador (salida ordenada)."""
+        self._conexion.execute(
+            "UPDATE tareas SET lease = NULL, trabajador = NULL"
+            " WHERE trabajador = ? AND id NOT IN (SELECT id FROM resultados)",
+            (trabajador,)
+        )
+        self._conexion.execute("DELETE FROM trabajadores WHERE nombre = ?", (trabajador,))
+
+    def cerrar(self):
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
+
+    @staticmethod
+    def nombre_trabajador() -> str:
+        """Nombre único del trabajador: host, PID y sufijo aleatorio."""
+        return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+class CoordinadorLeases:
+    """Lado coordinador de la cola distribuida, usado por `engine.main`.
+
+    Expone `iniciar`/`poner`/`cerrar`/`esperar`/`detener` igual que
+    `RepartidorProcesos`, de modo que el productor de tareas no distingue
+    entre modos. Las tareas se escriben en la cola por lotes y los resultados
+    se leen periódicamente y se entregan a `al_recibir`.
+
+    Attributes:
+        cola (ColaLeases): Cola SQLite compartida.
+        al_recibir (callable): Recibe (tarea, marca, precio, error) por cada resultado.
+        log (callable): Recibe mensajes de estado (reasignaciones).
+        reasignadas (int): Tareas liberadas de trabajadores caídos.
+    """
+
+    def __init__(self, ruta: str, al_recibir, log=print):
+        self.cola = ColaLeases(ruta)
+        self.al_recibir = al_recibir
+        self.log = log
+        self.reasignadas = 0
+        self._tareas = {}            # id -> TareaScraping sin resultado
+        self._por_escribir = []
+        self._siguiente_id = 0
+        self._ultimo_resultado = 0
+        self._cerrada = False
+        self._finalizada = False
+        self._recolector = None
+        self._terminado = None
+
+    def iniciar(self):
+        """Reinicia la cola compartida y empieza a recolectar resultados."""
+        self.cola.reiniciar()
+        self._terminado = asyncio.get_running_loop().create_future()
+        self._recolector = asyncio.create_task(self._recolectar())
+
+    def _escribir_pendientes(self):
+        if self._por_escribir:
+            self.cola.agregar(self._por_escribir)
+            self._por_escribir = []
+
+    async def _recolectar(self):
+        try:
+            while True:
+                self._escribir_pendientes()
+                reasignadas = self.cola.reasignar_vencidos()
+                if reasignadas:
+                    self.reasignadas += reasignadas
+                    self.log(f"Cola distribuida: {reasignadas} URLs reasignadas de trabajadores sin latido")
+                for orden, id_tarea, marca, precio, error in self.cola.resultados_desde(self._ultimo_resultado):
+                    self._ultimo_resultado = orden
+                    tarea = self._tareas.pop(id_tarea, None)
+                    if tarea is not None:
+                        self.al_recibir((tarea, marca, precio, error))
+                if self._cerrada and not self._tareas and not self._por_escribir:
+                    self._terminado.set_result(None)
+                    return
+                await asyncio.sleep(Config.INTERVALO_SONDEO_S)
+        except Exception as e:
+            # Un error de la cola (archivo bloqueado, disco) se propaga a `esperar`
+            self._terminado.set_exception(e)
+
+    async def poner(self, tarea):
+        """Agrega la tarea a la cola compartida (se escribe en el siguiente sondeo)."""
+        self._siguiente_id += 1
+        self._tareas[self._siguiente_id] = tarea
+        self._por_escribir.append((self._siguiente_id, tarea.tienda, tarea.url, tarea.metodo))
+        if len(self._por_escribir) >= Config.TAMANO_LEASE:
+            self._escribir_pendientes()
+
+    async def cerrar(self):
+        """Indica que no llegarán más tareas."""
+        self._escribir_pendientes()
+        self._cerrada = True
+
+    async def esperar(self):
+        """Espera todos los resultados y termina la corrida.
+
+        Returns:
+            None: Las estadísticas de scraping quedan en cada trabajador.
+        """
+        try:
+            await self._terminado
+        finally:
+            self.finalizar()
+        return None
+
+    async def detener(self):
+        """Termina la corrida sin esperar los resultados faltantes."""
+        self.finalizar()
+
+    def finalizar(self):
+        """Marca la corrida como terminada y cierra la cola (una sola vez; no requiere event loop)."""
+        if self._finalizada:
+            return
+        self._finalizada = True
+        if self._recolector is not None:
+            self._recolector.cancel()
+        try:
+            self.cola.terminar()
+        finally:
+            self.cola.cerrar()
@@ -22,6 +22,33 @@ except ImportError:
     RAPIDFUZZ_DISPONIBLE = False
 # =========================================
 
+# ========== IMPORTAR CALAMINE (lector Excel en Rust) ==========
+try:
+    import python_calamine  # noqa: F401
+    import pandas as _pd
+    # pandas acepta engine="calamine" desde la versión 2.2
+    CALAMINE_DISPONIBLE = tuple(int(parte) for parte in _pd.__version__.split('.')[:2]) >= (2, 2)
+except ImportError:
+    CALAMINE_DISPONIBLE = False
+# ==============================================================
+
+# ========== IMPORTAR CSSSELECT (selectores CSS para el backend lxml) ==========
+try:
+    import lxml.html  # noqa: F401
+    import cssselect  # noqa: F401
+    LXML_CSS_DISPONIBLE = True
+except ImportError:
+    LXML_CSS_DISPONIBLE = False
+# ==============================================================================
+
+# ========== IMPORTAR AIOHTTP (cliente HTTP asíncrono) ==========
+try:
+    import aiohttp  # noqa: F401
+    AIOHTTP_DISPONIBLE = True
+except ImportError:
+    AIOHTTP_DISPONIBLE = False
+# ===============================================================
+
 # Configuración de ruta de navegadores para ejecutable empaquetado
 if getattr(sys, 'frozen', False):
     # Cuando está empaquetado con PyInstaller
@@ -53,15 +80,75 @@ class Config:
     # --- AJUSTES DE VELOCIDAD Y CONCURRENCIA ---
     CONCURRENCIA_GLOBAL = 8   # Total de pestañas simultáneas
     CONCURRENCIA_POR_TIENDA = 2 # Máximo de pestañas por dominio 
+    PROCESOS_SCRAPING = 1     # Procesos de scraping, cada uno con su navegador (>1 reparte los dominios)
+    NAVEGACIONES_POR_CONTEXTO = 50 # Reciclar cada contexto de navegador tras N páginas
+    ESPERA_LISTO_MAXIMA_MS = 4000  # Tope de espera a que el precio se renderice (tiendas dinámicas)
+    PROCESOS_PARSEO = None         # Procesos para parsear HTML fuera del event loop (None = núcleos, 0 = en línea)
+    PARSER_HTML = "auto"           # "auto" (lxml si está disponible), "lxml" o "bs4"
+    PARSEO_PARCIAL = True          # Intentar primero solo con meta tags / JSON-LD / __STATE__
+    
+    # BLOQUEO DE RECURSOS (por contexto de navegador)
+    RECURSOS_BLOQUEADOS = ['image', 'stylesheet', 'font', 'media', 'manifest']  # Por extensión de la URL
+    EXTENSIONES_POR_RECURSO = {
+        'image': ['png', 'jpg', 'jpeg', 'gif', 'webp', 'avif', 'svg', 'ico', 'bmp'],
+        'stylesheet': ['css'],
+        'font': ['woff', 'woff2', 'ttf', 'otf', 'eot'],
+        'media': ['mp4', 'webm', 'mp3', 'm4a', 'ogg', 'wav'],
+        'manifest': ['webmanifest'],
+    }
+    HOSTS_TERCEROS_BLOQUEADOS = [  # Analítica, publicidad, chats y widgets
+        'google-analytics.com', 'googletagmanager.com', 'doubleclick.net', 'googlesyndication.com',
+        'googleadservices.com', 'facebook.net', 'facebook.com', 'hotjar.com',
+        'clarity.ms', 'tawk.to', 'zendesk.com', 'zdassets.com', 'jivosite.com', 'onesignal.com',
+        'newrelic.com', 'nr-data.net', 'youtube.com', 'ytimg.com', 'criteo.com', 'criteo.net',
+        'tiktok.com', 'bing.com', 'linkedin.com', 'licdn.com', 'pinterest.com',
+    ]
+    HOSTS_BLOQUEADOS_POR_TIENDA = {}   # Fragmento de dominio -> hosts extra a bloquear
+    HOSTS_PERMITIDOS_POR_TIENDA = {}   # Fragmento de dominio -> hosts que nunca se bloquean
+    BYTES_ESTIMADOS_POR_RECURSO = {    # Tamaño medio para estimar el ahorro de ancho de banda
+        'image': 45_000, 'stylesheet': 30_000, 'font': 40_000, 'media': 500_000,
+        'script': 60_000, 'xhr': 5_000, 'fetch': 5_000, 'ping': 500, 'manifest': 1_000,
+    }
+    
+    # LIMITADOR DE TASA ADAPTATIVO (por dominio, peticiones/segundo)
+    TASA_INICIAL_POR_DOMINIO = 1.0
+    TASA_MINIMA_POR_DOMINIO = 0.2
+    TASA_MAXIMA_POR_DOMINIO = 10.0
+    INCREMENTO_TASA = 0.2          # Aumento aditivo por respuesta saludable
+    FACTOR_REDUCCION_TASA = 0.5    # Reducción multiplicativa ante 429/timeout/error
+    LATENCIA_SALUDABLE = 6.0       # Segundos; sobre esto la tasa no aumenta
+    TAMANO_BLOQUE_MATCHING = 200   # Productos por bloque de matching antes de encolar sus URLs
+    TAMANO_COLA_TAREAS = 512       # Máximo de URLs encoladas esperando scraping
     TAMANO_LOTE_GUARDADO = 100 # Guardar Excel cada 100 productos procesados
+    ARCHIVO_BITACORA = "Resultado_Parcial.jsonl"  # Bitácora append-only de resultados
+    
+    # MODO DISTRIBUIDO (coordinador + trabajadores sobre una cola SQLite compartida)
+    COLA_DISTRIBUIDA = None        # Archivo de la cola (relativo al directorio actual); si se define, el scraping lo hacen los trabajadores
+    TAMANO_LEASE = 20              # URLs que un trabajador toma de una vez
+    LEASE_EXPIRACION_S = 60        # Sin latido por este tiempo, las URLs del trabajador se reasignan
+    INTERVALO_SONDEO_S = 0.5       # Frecuencia con que coordinador y trabajadores leen la cola
+    
+    # CACHÉ DE RESULTADOS DE SCRAPING (SQLite, por URL)
+    ARCHIVO_CACHE_SCRAPING = "cache_scraping.sqlite"
+    TTL_CACHE_HORAS = 24           # Vigencia por defecto de un precio cacheado
+    TTL_CACHE_POR_TIENDA = {}      # Vigencia por tienda, ej: {'SONEPAR': 6, 'DARTEL': 12}
+    TTL_CACHE_ERROR_HORAS = 1      # Vigencia de resultados con error (reintentar pronto)
     
     CARPETA_TIENDAS = "TIENDAS"
+    SUFIJO_CACHE_TIENDAS = "_cache"   # Caché binaria junto a TIENDAS (TIENDAS_cache/)
+    VERSION_CACHE_TIENDAS = 1         # Incrementar si cambia la normalización de catálogos
+    PROCESOS_CARGA_TIENDAS = None     # Procesos para leer catálogos en paralelo (None = núcleos)
+    MOTOR_EXCEL = "auto"              # "auto" (calamine si está instalado), "calamine" u "openpyxl"
     
     # UMBRALES DE SIMILITUD 
     UMBRAL_ALTA_PRECISION = 85      # Similitud mínima para match confiable
     UMBRAL_MEDIA_PRECISION = 75     # Similitud para match probable
     UMBRAL_BAJA_PRECISION = 65      # Similitud mínima aceptable
     
+    # MATCHING POR LOTES
+    MATCH_LOTE_MAX_CELDAS = 4_000_000  # Celdas por bloque de la matriz de scores (~32 MB)
+    MATCH_LOTE_WORKERS = -1            # Hilos de RapidFuzz (-1 = todos los núcleos)
+    
     
     # Textos de Salida
     TEXTO_LOGIN = "Ver Web / Login"
@@ -77,6 +164,11 @@ class Config:
     TIENDAS_CON_IVA = ['COMPRATECNO', 'COMDIEL', 'DARTEL', 'EECOL', 'GOBANTES', 'VITEL']
     TIENDAS_SOLO_MARCA = ['SONEPAR', 'TRANSWORLD', 'INTCOMEX']
     
+    # Política de descarga por tienda (fragmentos de dominio)
+    TIENDAS_HTTP_DIRECTO = ['vitel', 'compratecno', 'eecol', 'artilec']  # Precio en el HTML del servidor
+    TIENDAS_DINAMICAS = ['sonepar', 'dartel']                           # Requieren navegador (JavaScript)
+    TIMEOUT_HTTP_DIRECTO = 20  # Segundos
+    
     PALABRAS_IGNORAR = [
         'ODF', 'JUMPER', 'MUFA', 'MANGUITO', 'BANDEJA', 'SPLITTER', 'NAP', 'ROSETA',
         'PIGTAIL', 'PATCHCORD', 'PATCH', 'CORD', 'CONNECTOR', 'ADAPTER', 'DISTRIBUIDOR',
@@ -7,13 +7,25 @@ de las tiendas, utilizando JSON-LD, meta tags y búsqueda de texto.
 
 import re
 import json
-from typing import Optional
+from typing import Optional, Tuple
 
-from .config import Config, TASA_DOLAR
+from bs4 import BeautifulSoup
+
+from .config import Config, TASA_DOLAR, LXML_CSS_DISPONIBLE
 from .utils import Utils
 from .store_strategies import StoreStrategies
 
 
+# Fuentes de datos estructurados, en orden de documento: meta tags, JSON-LD
+# y el template __STATE__ de VTEX.
+_RE_DATOS_ESTRUCTURADOS = re.compile(
+    r'<meta\b[^>]*>'
+    r'|<script\b[^>]*application/ld\+json[^>]*>.*?</script>'
+    r'|<template\b[^>]*__STATE__[^>]*>.*?</template>',
+    re.I | re.S
+)
+
+
 class ContentParser:
     """Parseo genérico de HTML para extracción de marcas y precios.
     
@@ -22,6 +34,10 @@ class ContentParser:
     meta tags, y búsqueda de texto para maximizar la tasa de éxito.
     
     Note:
+        - El HTML se parsea con lxml o BeautifulSoup según `Config.PARSER_HTML`;
+          ambos backends exponen la misma API a las estrategias
+        - `extraer_de_html_parcial` intenta primero solo con los datos
+          estructurados de la página antes de construir el DOM completo
         - Intenta primero estrategias específicas por tienda (StoreStrategies)
         - Luego aplica estrategias genéricas (JSON-LD, meta tags)
         - Finalmente busca en el texto de la página
@@ -131,3 +147,134 @@ class ContentParser:
                 p = Utils.limpiar_precio_clp(texto)
                 if p > 1000: return p 
         return 0
+
+    @staticmethod
+    def backend_html() -> str:
+        """Retorna el backend de parseo HTML a usar según `Config.PARSER_HTML`.
+        
+        Returns:
+            str: 'lxml' si está configurado (o en modo 'auto') y disponible,
+                'bs4' en otro caso.
+        """
+        if Config.PARSER_HTML in ('auto', 'lxml') and LXML_CSS_DISPONIBLE:
+            return 'lxml'
+        return 'bs4'
+
+    @classmethod
+    def parsear(cls, html: str, backend: Optional[str] = None):
+        """Parsea HTML crudo con el backend indicado (o el configurado).
+        
+        Si lxml no puede parsear la página, reintenta con BeautifulSoup.
+        
+        Args:
+            html (str): HTML de la página.
+            backend (str, optional): 'lxml' o 'bs4'.
+        
+        Returns:
+            NodoLxml o BeautifulSoup: Documento con la API usada por las estrategias.
+        """
+        if (backend or cls.backend_html()) == 'lxml':
+            try:
+                from .lxml_backend import NodoLxml
+                return NodoLxml.desde_html(html)
+            except Exception:
+                pass
+        return BeautifulSoup(html, 'html.parser')
+
+    @classmethod
+    def extraer_de_html(cls, html: str, url: str, backend: Optional[str] = None) -> Tuple[int, str]:
+        """Parsea HTML crudo y extrae precio y marca.
+        
+        Punto de entrada común para las páginas obtenidas por navegador o por
+        HTTP directo.
+        
+        Args:
+            html (str): HTML de la página.
+            url (str): URL de la página para identificar la tienda.
+            backend (str, optional): 'lxml' o 'bs4' (por defecto `backend_html()`).
+        
+        Returns:
+            Tuple[int, str]: (precio_clp, marca)
+        """
+        soup = cls.parsear(html, backend)
+        return cls.extraer_precio(soup, url), cls.extraer_marca(soup, url)
+
+    @staticmethod
+    def interpretar_extraccion_navegador(datos: dict, url: str) -> Optional[Tuple[int, str]]:
+        """Convierte los candidatos de un script de `StoreStrategies.get_browser_strategy`.
+        
+        Args:
+            datos (dict): {'precios': [{'numero'} | {'texto'}], 'marcas': [str]}
+                retornado por `page.evaluate`.
+            url (str): URL de la página para identificar la tienda.
+        
+        Returns:
+            Optional[Tuple[int, str]]: (precio_clp, marca), o None si no se
+                encontró precio (salvo tiendas solo-marca) y hay que parsear la página.
+        """
+        precio = 0
+        for candidato in datos.get('precios') or []:
+            try:
+                if candidato.get('numero') is not None:
+                    precio = int(float(candidato['numero']))
+                else:
+                    precio = Utils.limpiar_precio_clp(candidato.get('texto') or "")
+            except (TypeError, ValueError):
+                precio = 0
+            if precio > 0: break
+        marca = next((m for m in map(Utils.validar_marca, datos.get('marcas') or []) if m), None)
+        
+        if any(t.lower() in url.lower() for t in Config.TIENDAS_SOLO_MARCA):
+            return (0, marca) if marca else None
+        if precio <= 0:
+            return None
+        return precio, marca or "Sin Marca"
+
+    @staticmethod
+    def admite_parseo_parcial(url: str) -> bool:
+        """Indica si la tienda obtiene precio y marca primero de datos estructurados.
+        
+        Las tiendas con estrategias que leen el DOM antes que los meta tags o
+        el JSON-LD (p. ej. Vitel, Compratecno, LK) podrían dar un resultado
+        distinto con el documento reducido, por lo que siempre usan el DOM completo.
+        """
+        url_lower = url.lower()
+        if 'automatec' in url_lower or StoreStrategies.get_brand_strategy(url_lower):
+            return False
+        estrategia = StoreStrategies.get_price_strategy(url_lower)
+        return estrategia is None or estrategia is StoreStrategies.extract_dartel_price
+
+    @staticmethod
+    def documento_estructurado(html: str) -> str:
+        """Construye un documento mínimo con los meta tags, JSON-LD y __STATE__ del HTML."""
+        return "<html><head>" + "".join(m.group(0) for m in _RE_DATOS_ESTRUCTURADOS.finditer(html)) + "</head></html>"
+
+    @classmethod
+    def extraer_de_html_parcial(cls, html: str, url: str) -> Tuple[int, str, bool]:
+        """Extrae precio y marca probando primero solo los datos estructurados.
+        
+        Escanea el HTML crudo buscando meta tags, scripts JSON-LD y el template
+        __STATE__ de VTEX, y parsea únicamente esos fragmentos. Si no entregan
+        precio (salvo tiendas solo-marca) y marca, parsea la página completa.
+        En Dartel solo se acepta el precio del __STATE__.
+        
+        Args:
+            html (str): HTML de la página.
+            url (str): URL de la página para identificar la tienda.
+        
+        Returns:
+            Tuple[int, str, bool]: (precio_clp, marca, resuelto_con_datos_estructurados)
+        """
+        if Config.PARSEO_PARCIAL and cls.admite_parseo_parcial(url):
+            soup = cls.parsear(cls.documento_estructurado(html))
+            precio, marca = cls.extraer_precio(soup, url), cls.extraer_marca(soup, url)
+            solo_marca = any(t.lower() in url.lower() for t in Config.TIENDAS_SOLO_MARCA)
+            # Sin __STATE__ la página completa de Dartel toma el precio del DOM antes que
+            # cualquier meta: en el documento reducido solo vale el precio del __STATE__
+            if (StoreStrategies.get_price_strategy(url.lower()) is StoreStrategies.extract_dartel_price
+                    and StoreStrategies.extract_dartel_state_price(soup) != precio):
+                precio = 0
+            if (precio > 0 or solo_marca) and marca != "Sin Marca":
+                return precio, marca, True
+        precio, marca = cls.extraer_de_html(html, url)
+        return precio, marca, False
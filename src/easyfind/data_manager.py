@@ -7,27 +7,199 @@ de precisión para la búsqueda de productos.
 
 import os
 import re
-from typing import Tuple, Optional
+import json
+import time
+import hashlib
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple, Optional
 
+import numpy as np
 import pandas as pd
 
-from .config import Config, RAPIDFUZZ_DISPONIBLE
+from .config import Config, RAPIDFUZZ_DISPONIBLE, CALAMINE_DISPONIBLE
 from .utils import Utils
 
 if RAPIDFUZZ_DISPONIBLE:
     from rapidfuzz import fuzz, process
 
 
-class DataManager:
-    """Carga de bases de datos y lógica de coincidencia difusa para búsqueda de productos."""
+class IndiceTokens:
+    """Índice invertido (token -> filas) sobre la columna Nombre_Norm de una tienda.
+    
+    Reemplaza el filtro fila a fila de tokens críticos por intersección y conteo
+    de listas de posiciones. Las listas se indexan por palabra del catálogo; un
+    token crítico se resuelve uniendo las listas de todas las palabras que lo
+    contienen, lo que conserva la semántica de subcadena (`token in texto`) del
+    filtro original.
+    
+    Attributes:
+        nombres (List[str]): Nombres normalizados en el orden de las filas.
+        etiquetas (pd.Index): Etiquetas de índice de las filas indexadas.
+    """
+    
+    __slots__ = ('nombres', 'etiquetas', '_vocabulario', '_filas_por_token')
+    
+    def __init__(self, nombres_norm: List[str], etiquetas: Optional[pd.Index] = None):
+        self.nombres = list(nombres_norm)
+        self.etiquetas = etiquetas if etiquetas is not None else pd.RangeIndex(len(self.nombres))
+        
+        vocabulario = defaultdict(list)
+        for pos, nombre in enumerate(self.nombres):
+            for palabra in set(nombre.split()):
+                vocabulario[palabra].append(pos)
+        self._vocabulario = {p: np.array(filas, dtype=np.int64) for p, filas in vocabulario.items()}
+        self._filas_por_token: Dict[str, np.ndarray] = {}
+    
+    def __len__(self) -> int:
+        return len(self.nombres)
+    
+    def filas_con_token(self, token: str) -> np.ndarray:
+        """Retorna las posiciones (ordenadas, sin repetir) cuyas palabras contienen el token."""
+        filas = self._filas_por_token.get(token)
+        if filas is None:
+            listas = [pos for palabra, pos in self._vocabulario.items() if token in palabra]
+            filas = np.unique(np.concatenate(listas)) if listas else np.empty(0, dtype=np.int64)
+            self._filas_por_token[token] = filas
+        return filas
+    
+    def candidatos(self, tokens: List[str], proporcion: float = 0.7) -> np.ndarray:
+        """Posiciones de las filas que contienen al menos `proporcion` de los tokens.
+        
+        Args:
+            tokens (List[str]): Tokens críticos de la búsqueda (se cuentan repetidos).
+            proporcion (float): Fracción mínima de tokens presentes en la fila.
+        
+        Returns:
+            np.ndarray: Posiciones ascendentes de las filas candidatas.
+        """
+        if not tokens or not self.nombres:
+            return np.empty(0, dtype=np.int64)
+        conteo = np.zeros(len(self.nombres), dtype=np.int32)
+        for token in tokens:
+            conteo[self.filas_con_token(token)] += 1
+        return np.flatnonzero(conteo >= len(tokens) * proporcion)
+
+
+class CacheCatalogos:
+    """Caché en disco de catálogos de tienda ya normalizados.
+    
+    Guarda por archivo fuente el DataFrame procesado (['Nombre', 'URL', 'Tienda',
+    'Nombre_Norm']) en formato pickle, junto a un manifiesto JSON con el tamaño,
+    mtime y hash SHA-256 del archivo original. Si tamaño y mtime coinciden el
+    archivo se carga sin volver a leerlo; si solo cambió el mtime se compara el
+    hash antes de re-parsear.
+    
+    Attributes:
+        carpeta (str): Carpeta de la caché (ej: 'TIENDAS_cache/').
+        aciertos (int): Archivos servidos desde la caché.
+    """
+    
+    MANIFIESTO = "manifiesto.json"
+    
+    def __init__(self, carpeta: str):
+        self.carpeta = carpeta
+        self.aciertos = 0
+        self._manifiesto = {}
+        try:
+            with open(os.path.join(carpeta, self.MANIFIESTO), encoding='utf-8') as f:
+                manifiesto = json.load(f)
+            if manifiesto.get('version') == Config.VERSION_CACHE_TIENDAS:
+                self._manifiesto = manifiesto.get('archivos', {})
+        except (OSError, ValueError):
+            pass
     
     @staticmethod
-    def cargar_bases_datos(ruta_carpeta: str) -> pd.DataFrame:
+    def _hash_archivo(ruta: str) -> str:
+        h = hashlib.sha256()
+        with open(ruta, 'rb') as f:
+            for bloque in iter(lambda: f.read(1 << 20), b''):
+                h.update(bloque)
+        return h.hexdigest()
+    
+    def _ruta_pickle(self, archivo: str) -> str:
+        return os.path.join(self.carpeta, archivo + ".pkl")
+    
+    def obtener(self, ruta: str) -> Optional[pd.DataFrame]:
+        """Retorna el catálogo procesado si el archivo fuente no cambió, o None."""
+        archivo = os.path.basename(ruta)
+        entrada = self._manifiesto.get(archivo)
+        if not entrada:
+            return None
+        try:
+            st = os.stat(ruta)
+            if entrada['tamano'] != st.st_size:
+                return None
+            if entrada['mtime'] != st.st_mtime_ns:
+                if entrada['hash'] != self._hash_archivo(ruta):
+                    return None
+                entrada['mtime'] = st.st_mtime_ns
+            df = pd.read_pickle(self._ruta_pickle(archivo))
+            self.aciertos += 1
+            return df
+        except Exception:
+            return None
+    
+    def guardar(self, ruta: str, df: pd.DataFrame):
+        """Guarda el catálogo procesado de un archivo fuente en la caché."""
+        archivo = os.path.basename(ruta)
+        try:
+            os.makedirs(self.carpeta, exist_ok=True)
+            st = os.stat(ruta)
+            destino = self._ruta_pickle(archivo)
+            df.to_pickle(destino + ".tmp")
+            os.replace(destino + ".tmp", destino)
+            self._manifiesto[archivo] = {
+                'tamano': st.st_size,
+                'mtime': st.st_mtime_ns,
+                'hash': self._hash_archivo(ruta),
+            }
+        except Exception as e:
+            print(f"Caché {archivo}: {e}")
+    
+    def guardar_manifiesto(self, archivos_vigentes: List[str]):
+        """Escribe el manifiesto y elimina entradas de archivos que ya no existen."""
+        for archivo in list(self._manifiesto):
+            if archivo not in archivos_vigentes:
+                del self._manifiesto[archivo]
+                try: os.remove(self._ruta_pickle(archivo))
+                except OSError: pass
+        if not self._manifiesto and not os.path.isdir(self.carpeta):
+            return
+        try:
+            os.makedirs(self.carpeta, exist_ok=True)
+            destino = os.path.join(self.carpeta, self.MANIFIESTO)
+            with open(destino + ".tmp", 'w', encoding='utf-8') as f:
+                json.dump({'version': Config.VERSION_CACHE_TIENDAS, 'archivos': self._manifiesto}, f)
+            os.replace(destino + ".tmp", destino)
+        except OSError as e:
+            print(f"Caché manifiesto: {e}")
+
+
+class DataManager:
+    """Carga de bases de datos y lógica de coincidencia difusa para búsqueda de productos.
+    
+    Attributes:
+        indices_tokens (Dict[str, IndiceTokens]): Índices invertidos por tienda,
+            construidos en `cargar_bases_datos`.
+    """
+    
+    indices_tokens: Dict[str, IndiceTokens] = {}
+    
+    PRECISION_ALTA = "Alta Precisión"
+    PRECISION_MEDIA = "Media Precisión"
+    PRECISION_BAJA = "Baja Precisión"
+    
+    @classmethod
+    def cargar_bases_datos(cls, ruta_carpeta: str) -> pd.DataFrame:
         """Carga y unifica todas las bases de datos de tiendas desde una carpeta.
         
-        Lee archivos Excel (.xlsx) y CSV (.csv) de la carpeta especificada,
-        extrae las columnas de nombre y URL, y las unifica en un solo DataFrame
-        con el texto normalizado para búsqueda difusa.
+        Lee archivos Excel (.xlsx) y CSV (.csv) de la carpeta especificada
+        (en paralelo, un proceso por archivo), extrae las columnas de nombre y URL, y las unifica en un solo DataFrame
+        con el texto normalizado para búsqueda difusa. Los archivos sin cambios
+        se leen desde la caché binaria (`CacheCatalogos`) ubicada junto a la
+        carpeta. También construye el índice invertido de tokens de cada tienda
+        (`indices_tokens`).
         
         Args:
             ruta_carpeta (str): Ruta a la carpeta que contiene los archivos
@@ -37,40 +209,165 @@ class DataManager:
             pd.DataFrame: DataFrame unificado con columnas ['Nombre', 'URL', 'Tienda', 'Nombre_Norm'].
                 Retorna DataFrame vacío si no hay archivos válidos.
         """
-        dfs = []
+        cls.indices_tokens = {}
         if not os.path.exists(ruta_carpeta):
             os.makedirs(ruta_carpeta)
             return pd.DataFrame()
 
         archivos = [f for f in os.listdir(ruta_carpeta) if f.endswith(('.xlsx', '.csv')) and not f.startswith('~$')]
         print(f"Cargando {len(archivos)} bases de datos...")
+        cache = CacheCatalogos(os.path.abspath(ruta_carpeta).rstrip(os.sep) + Config.SUFIJO_CACHE_TIENDAS)
         
+        catalogos = {}
+        pendientes = []
         for archivo in archivos:
-            nombre_tienda = archivo.replace("Base_Datos_", "").replace(".xlsx", "").replace(".csv", "").replace("Base_Datos", "").upper().strip()
-            
-            nombre_tienda = nombre_tienda.replace("_", " ")
-            
             ruta = os.path.join(ruta_carpeta, archivo)
+            catalogos[archivo] = cache.obtener(ruta)
+            if catalogos[archivo] is None:
+                pendientes.append(ruta)
+        
+        for ruta, temp, segundos in cls._cargar_archivos_paralelo(pendientes):
+            print(f"  {os.path.basename(ruta)}: {segundos:.1f}s")
+            if temp is not None:
+                cache.guardar(ruta, temp)
+            catalogos[os.path.basename(ruta)] = temp
+        
+        dfs = [catalogos[a] for a in archivos if catalogos[a] is not None]
+        cache.guardar_manifiesto(archivos)
+        if cache.aciertos:
+            print(f"{cache.aciertos}/{len(archivos)} bases de datos leídas desde caché")
+        if not dfs:
+            return pd.DataFrame()
+        
+        df_final = pd.concat(dfs, ignore_index=True)
+        if RAPIDFUZZ_DISPONIBLE:
+            cls.indices_tokens = {
+                tienda: IndiceTokens(grupo['Nombre_Norm'].tolist(), grupo.index)
+                for tienda, grupo in df_final.groupby('Tienda', sort=False)
+            }
+        return df_final
+
+    @staticmethod
+    def motor_excel() -> str:
+        """Retorna el motor de lectura Excel a usar según `Config.MOTOR_EXCEL`.
+        
+        Returns:
+            str: 'calamine' si está configurado (o en modo 'auto') y disponible,
+                'openpyxl' en otro caso.
+        """
+        if Config.MOTOR_EXCEL in ('auto', 'calamine') and CALAMINE_DISPONIBLE:
+            return 'calamine'
+        return 'openpyxl'
+
+    @classmethod
+    def leer_excel(cls, ruta: str, **kwargs) -> pd.DataFrame:
+        """Lee un archivo .xlsx con el motor configurado.
+        
+        Si el motor calamine falla con un archivo en particular, reintenta
+        con openpyxl.
+        
+        Args:
+            ruta (str): Ruta al archivo Excel.
+            **kwargs: Argumentos adicionales para `pd.read_excel`.
+        
+        Returns:
+            pd.DataFrame: Contenido de la primera hoja.
+        """
+        motor = cls.motor_excel()
+        if motor == 'calamine':
             try:
-                if archivo.endswith('.csv'): df = pd.read_csv(ruta, on_bad_lines='skip')
-                else: df = pd.read_excel(ruta)
-                df.columns = [c.strip().lower() for c in df.columns]
-                col_nombre = next((c for c in df.columns if c in ['nombre', 'producto', 'nombre del producto', 'itemname']), None)
-                col_link = next((c for c in df.columns if c in ['link', 'url', 'enlace']), None)
-
-                if col_nombre and col_link:
-                    temp = df[[col_nombre, col_link]].copy()
-                    temp.columns = ['Nombre', 'URL']
-                    temp['Tienda'] = nombre_tienda
-                    temp['Nombre_Norm'] = temp['Nombre'].astype(str).apply(Utils.normalizar_texto)
-                    temp = temp.dropna(subset=['URL'])
-                    dfs.append(temp)
+                return pd.read_excel(ruta, engine='calamine', **kwargs)
             except Exception as e:
-                print(f"Error {archivo}: {e}")
-        return pd.concat(dfs, ignore_index=True) if dfs else pd.DataFrame()
+                print(f"Calamine falló con {os.path.basename(ruta)} ({e}). Usando openpyxl.")
+        return pd.read_excel(ruta, engine='openpyxl', **kwargs)
+
+    @classmethod
+    def _cargar_archivos_paralelo(cls, rutas: List[str]):
+        """Parsea archivos de tienda en procesos separados.
+        
+        Cada archivo se lee, detecta columnas y normaliza en un proceso del
+        pool, de modo que el tiempo total queda acotado por el archivo más
+        lento. Con un solo archivo (o si el pool no puede iniciarse) se
+        procesa en el proceso actual.
+        
+        Args:
+            rutas (List[str]): Rutas de los archivos a parsear.
+        
+        Returns:
+            List[Tuple[str, Optional[pd.DataFrame], float]]: (ruta, catálogo, segundos de carga)
+                por cada archivo.
+        """
+        procesos = min(len(rutas), Config.PROCESOS_CARGA_TIENDAS or os.cpu_count() or 1)
+        if procesos > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=procesos) as pool:
+                    return list(pool.map(cls._cargar_archivo_cronometrado, rutas))
+            except Exception as e:
+                print(f"Carga paralela no disponible ({e}). Cargando en serie.")
+        return [cls._cargar_archivo_cronometrado(ruta) for ruta in rutas]
+
+    @classmethod
+    def _cargar_archivo_cronometrado(cls, ruta: str):
+        inicio = time.perf_counter()
+        temp = cls._cargar_archivo_tienda(ruta)
+        return ruta, temp, time.perf_counter() - inicio
 
     @staticmethod
-    def _match_con_rapidfuzz(busqueda: str, df_tienda: pd.DataFrame, umbral: int) -> Tuple[Optional[str], Optional[str], int]:
+    def _cargar_archivo_tienda(ruta: str) -> Optional[pd.DataFrame]:
+        """Lee un archivo de tienda y lo lleva al formato unificado normalizado.
+        
+        Args:
+            ruta (str): Ruta al archivo Base_Datos_*.xlsx/.csv.
+        
+        Returns:
+            Optional[pd.DataFrame]: DataFrame con columnas ['Nombre', 'URL', 'Tienda',
+                'Nombre_Norm'], o None si el archivo no tiene columnas válidas o falla.
+        """
+        archivo = os.path.basename(ruta)
+        nombre_tienda = archivo.replace("Base_Datos_", "").replace(".xlsx", "").replace(".csv", "").replace("Base_Datos", "").upper().strip()
+        
+        nombre_tienda = nombre_tienda.replace("_", " ")
+        
+        try:
+            if archivo.endswith('.csv'): df = pd.read_csv(ruta, on_bad_lines='skip')
+            else: df = DataManager.leer_excel(ruta)
+            df.columns = [c.strip().lower() for c in df.columns]
+            col_nombre = next((c for c in df.columns if c in ['nombre', 'producto', 'nombre del producto', 'itemname']), None)
+            col_link = next((c for c in df.columns if c in ['link', 'url', 'enlace']), None)
+
+            if col_nombre and col_link:
+                temp = df[[col_nombre, col_link]].copy()
+                temp.columns = ['Nombre', 'URL']
+                temp['Tienda'] = nombre_tienda
+                temp['Nombre_Norm'] = temp['Nombre'].astype(str).apply(Utils.normalizar_texto)
+                temp = temp.dropna(subset=['URL'])
+                return temp
+        except Exception as e:
+            print(f"Error {archivo}: {e}")
+        return None
+
+    @classmethod
+    def obtener_indice(cls, df_tienda: pd.DataFrame) -> IndiceTokens:
+        """Retorna el índice invertido correspondiente a un DataFrame de tienda.
+        
+        Usa el índice construido en `cargar_bases_datos` si cubre exactamente las
+        mismas filas; en otro caso construye uno nuevo para el DataFrame dado.
+        
+        Args:
+            df_tienda (pd.DataFrame): DataFrame con productos de una tienda.
+        
+        Returns:
+            IndiceTokens: Índice alineado posicionalmente con `df_tienda`.
+        """
+        if 'Tienda' in df_tienda.columns and not df_tienda.empty:
+            indice = cls.indices_tokens.get(df_tienda['Tienda'].iat[0])
+            if indice is not None and indice.etiquetas.equals(df_tienda.index):
+                return indice
+        return IndiceTokens(df_tienda['Nombre_Norm'].tolist(), df_tienda.index)
+
+    @classmethod
+    def _match_con_rapidfuzz(cls, busqueda: str, df_tienda: pd.DataFrame, umbral: int,
+                             indice: Optional[IndiceTokens] = None) -> Tuple[Optional[str], Optional[str], int]:
         """
         Búsqueda mejorada usando RapidFuzz para similitud difusa.
         
@@ -78,6 +375,8 @@ class DataManager:
             busqueda: Texto del producto a buscar
             df_tienda: DataFrame con productos de la tienda
             umbral: Score mínimo de similitud (0-100)
+            indice: Índice invertido de la tienda (alineado con df_tienda).
+                Si es None se obtiene con `obtener_indice`.
             
         Returns:
             Tuple[URL, Nombre, Score]: Mejor match encontrado
@@ -87,28 +386,21 @@ class DataManager:
         
         busqueda_norm = Utils.normalizar_texto(busqueda)
         caracteristicas_busqueda = Utils.extraer_caracteristicas(busqueda)
+        if indice is None:
+            indice = cls.obtener_indice(df_tienda)
         
         # Paso 1: Filtro por tokens críticos (números y códigos técnicos)
-        df_candidatos = df_tienda.copy()
-        tokens_criticos = caracteristicas_busqueda['tokens_criticos']
-        
-        if tokens_criticos:
-            # Productos deben tener AL MENOS el 70% de los tokens críticos
-            def tiene_tokens_criticos(texto):
-                matches = sum(1 for token in tokens_criticos if token in texto)
-                return matches >= len(tokens_criticos) * 0.7
-            
-            df_candidatos = df_candidatos[
-                df_candidatos['Nombre_Norm'].apply(tiene_tokens_criticos)
-            ]
+        # Productos deben tener AL MENOS el 70% de los tokens críticos
+        posiciones = indice.candidatos(caracteristicas_busqueda['tokens_criticos'])
         
         # Si no hay candidatos con tokens críticos, usar toda la base
-        if df_candidatos.empty:
-            df_candidatos = df_tienda.copy()
+        if len(posiciones):
+            nombres_norm = [indice.nombres[i] for i in posiciones]
+        else:
+            posiciones = None
+            nombres_norm = indice.nombres
         
         # Paso 2: Calcular similitud con RapidFuzz
-        nombres_norm = df_candidatos['Nombre_Norm'].tolist()
-        
         # Token Set Ratio: ignora orden de palabras y duplicados
         resultado = process.extractOne(
             busqueda_norm,
@@ -119,7 +411,7 @@ class DataManager:
         
         if resultado:
             texto_match, score, idx = resultado
-            fila_ganadora = df_candidatos.iloc[idx]
+            fila_ganadora = df_tienda.iloc[idx if posiciones is None else posiciones[idx]]
             return fila_ganadora['URL'], fila_ganadora['Nombre'], score
         
         return None, None, 0
@@ -162,33 +454,176 @@ class DataManager:
         return None, None
 
     @classmethod
-    def buscar_match_alta_precision(cls, busqueda, df_tienda):
+    def clasificar_precision(cls, score: float) -> Optional[str]:
+        """Clasifica un score de similitud en su nivel de precisión.
+        
+        Args:
+            score (float): Score de similitud (0-100).
+        
+        Returns:
+            Optional[str]: 'Alta Precisión', 'Media Precisión', 'Baja Precisión',
+                o None si el score no alcanza el umbral mínimo.
+        """
+        if score >= Config.UMBRAL_ALTA_PRECISION: return cls.PRECISION_ALTA
+        if score >= Config.UMBRAL_MEDIA_PRECISION: return cls.PRECISION_MEDIA
+        if score >= Config.UMBRAL_BAJA_PRECISION: return cls.PRECISION_BAJA
+        return None
+
+    @classmethod
+    def buscar_match(cls, busqueda, df_tienda, indice=None) -> Tuple[Optional[str], Optional[str], float, Optional[str]]:
+        """Búsqueda en una sola pasada que clasifica el nivel de precisión del match.
+        
+        Calcula la similitud una única vez con el umbral más bajo y deriva el
+        nivel (Alta/Media/Baja) del score obtenido, en lugar de repetir la
+        búsqueda completa por cada umbral. El mejor candidato no depende del
+        umbral, por lo que el resultado es el mismo que el de las tres búsquedas
+        secuenciales.
+        
+        Args:
+            busqueda: Texto del producto a buscar.
+            df_tienda: DataFrame con productos de la tienda.
+            indice: Índice invertido de la tienda (opcional).
+        
+        Returns:
+            Tuple[URL, Nombre, Score, Nivel]: Mejor match y su nivel de precisión.
+                (None, None, 0, None) si no hay match. En modo legacy el score es 0.
+        """
+        if RAPIDFUZZ_DISPONIBLE:
+            url, nombre, score = cls._match_con_rapidfuzz(
+                busqueda, df_tienda, Config.UMBRAL_BAJA_PRECISION, indice
+            )
+            if url:
+                return url, nombre, score, cls.clasificar_precision(score)
+            return None, None, 0, None
+        
+        for factor, nivel in ((0.9, cls.PRECISION_ALTA), (0.75, cls.PRECISION_MEDIA), (0.6, cls.PRECISION_BAJA)):
+            url, nombre = cls._core_match_legacy(busqueda, df_tienda, factor_sensibilidad=factor)
+            if url:
+                return url, nombre, 0, nivel
+        return None, None, 0, None
+
+    @classmethod
+    def buscar_match_lote(cls, productos: List[str], df_tienda: pd.DataFrame,
+                          indice: Optional[IndiceTokens] = None) -> List[Tuple[Optional[str], Optional[str], float, Optional[str]]]:
+        """Busca el mejor match de una lista completa de productos en una tienda.
+        
+        Equivale a llamar `buscar_match` por cada producto, pero las búsquedas
+        que deben recorrer todo el catálogo (sin tokens críticos o sin candidatos)
+        se agrupan por texto normalizado y se resuelven juntas con
+        `process.cdist` sobre todos los núcleos, por bloques de a lo más
+        `Config.MATCH_LOTE_MAX_CELDAS` celdas para acotar la memoria. Las
+        búsquedas con candidatos prefiltrados usan `extractOne` sobre el
+        subconjunto.
+        
+        Args:
+            productos (List[str]): Textos de los productos a buscar (columna PRODUCTOS).
+            df_tienda (pd.DataFrame): DataFrame con productos de la tienda.
+            indice (IndiceTokens, optional): Índice invertido de la tienda.
+        
+        Returns:
+            List[Tuple[URL, Nombre, Score, Nivel]]: Un resultado por producto, en el
+                mismo orden de entrada.
+        """
+        sin_match = (None, None, 0, None)
+        if not RAPIDFUZZ_DISPONIBLE:
+            return [cls.buscar_match(p, df_tienda, indice) for p in productos]
+        if df_tienda.empty:
+            return [sin_match] * len(productos)
+        if indice is None:
+            indice = cls.obtener_indice(df_tienda)
+        
+        umbral = Config.UMBRAL_BAJA_PRECISION
+        mejores: List[Tuple[Optional[int], float]] = [(None, 0)] * len(productos)
+        completos: Dict[str, List[int]] = defaultdict(list)
+        
+        # Paso 1: prefiltro por tokens críticos; las búsquedas sin candidatos
+        # se agrupan por texto normalizado para el recorrido completo.
+        for i, busqueda in enumerate(productos):
+            if pd.isna(busqueda):
+                continue
+            busqueda_norm = Utils.normalizar_texto(busqueda)
+            tokens = Utils.extraer_caracteristicas(busqueda)['tokens_criticos']
+            posiciones = indice.candidatos(tokens)
+            if not len(posiciones):
+                completos[busqueda_norm].append(i)
+                continue
+            resultado = process.extractOne(
+                busqueda_norm,
+                [indice.nombres[j] for j in posiciones],
+                scorer=fuzz.token_set_ratio,
+                score_cutoff=umbral
+            )
+            if resultado:
+                mejores[i] = (int(posiciones[resultado[2]]), resultado[1])
+        
+        # Paso 2: matriz de scores por bloques contra el catálogo completo.
+        # Con un solo núcleo extractOne es más rápido (eleva su umbral al avanzar).
+        consultas = list(completos)
+        if (os.cpu_count() or 1) > 1:
+            filas_bloque = max(1, Config.MATCH_LOTE_MAX_CELDAS // len(indice))
+            for inicio in range(0, len(consultas), filas_bloque):
+                bloque = consultas[inicio:inicio + filas_bloque]
+                scores = process.cdist(
+                    bloque,
+                    indice.nombres,
+                    scorer=fuzz.token_set_ratio,
+                    score_cutoff=umbral,
+                    dtype=np.float64,
+                    workers=Config.MATCH_LOTE_WORKERS
+                )
+                ganadores = scores.argmax(axis=1)
+                for fila, (consulta, pos) in enumerate(zip(bloque, ganadores)):
+                    score = scores[fila, pos]
+                    if score >= umbral and score > 0:
+                        for i in completos[consulta]:
+                            mejores[i] = (int(pos), float(score))
+        else:
+            for consulta in consultas:
+                resultado = process.extractOne(
+                    consulta, indice.nombres, scorer=fuzz.token_set_ratio, score_cutoff=umbral
+                )
+                if resultado:
+                    for i in completos[consulta]:
+                        mejores[i] = (resultado[2], resultado[1])
+        
+        urls = df_tienda['URL'].to_numpy()
+        nombres = df_tienda['Nombre'].to_numpy()
+        resultados = []
+        for pos, score in mejores:
+            if pos is None or not urls[pos]:
+                resultados.append(sin_match)
+            else:
+                resultados.append((urls[pos], nombres[pos], score, cls.clasificar_precision(score)))
+        return resultados
+
+    @classmethod
+    def buscar_match_alta_precision(cls, busqueda, df_tienda, indice=None):
         """Búsqueda de alta precisión (match muy confiable)."""
         if RAPIDFUZZ_DISPONIBLE:
             url, nombre, score = cls._match_con_rapidfuzz(
-                busqueda, df_tienda, Config.UMBRAL_ALTA_PRECISION
+                busqueda, df_tienda, Config.UMBRAL_ALTA_PRECISION, indice
             )
             return url, nombre
         else:
             return cls._core_match_legacy(busqueda, df_tienda, factor_sensibilidad=0.9)
 
     @classmethod
-    def buscar_match_media_precision(cls, busqueda, df_tienda):
+    def buscar_match_media_precision(cls, busqueda, df_tienda, indice=None):
         """Búsqueda de precisión media (match probable)."""
         if RAPIDFUZZ_DISPONIBLE:
             url, nombre, score = cls._match_con_rapidfuzz(
-                busqueda, df_tienda, Config.UMBRAL_MEDIA_PRECISION
+                busqueda, df_tienda, Config.UMBRAL_MEDIA_PRECISION, indice
             )
             return url, nombre
         else:
             return cls._core_match_legacy(busqueda, df_tienda, factor_sensibilidad=0.75)
 
     @classmethod
-    def buscar_match_baja_precision(cls, busqueda, df_tienda):
+    def buscar_match_baja_precision(cls, busqueda, df_tienda, indice=None):
         """Búsqueda de baja precisión (último intento)."""
         if RAPIDFUZZ_DISPONIBLE:
             url, nombre, score = cls._match_con_rapidfuzz(
-                busqueda, df_tienda, Config.UMBRAL_BAJA_PRECISION
+                busqueda, df_tienda, Config.UMBRAL_BAJA_PRECISION, indice
             )
             return url, nombre
         else:
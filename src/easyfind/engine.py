@@ -6,58 +6,620 @@ y el scraping concurrente de URLs para comparación de precios.
 """
 
 import asyncio
+import multiprocessing
+import multiprocessing.connection
 import os
+import queue
 import sys
-import random
+import threading
+from typing import List, Optional
 
 import pandas as pd
-from collections import defaultdict
+from collections import defaultdict, deque
 
 from .config import Config, TASA_DOLAR, RAPIDFUZZ_DISPONIBLE
 from .data_manager import DataManager
+from .utils import Utils
 from .web_scraper import WebScraper
 from .content_parser import ContentParser
+from .result_journal import ResultJournal
+from .scrape_cache import CacheScraping
+from .cola_distribuida import ColaLeases, CoordinadorLeases
 
 # Necesitamos acceso mutable a TASA_DOLAR del módulo config
 from . import config as _config_module
 
 
-async def procesar_tarea_segura(sem_global, sem_dominio, scraper, tienda, url, row_idx, metodo_origen):
-    """Wrapper para scraping concurrente con limitación de tasa basada en semáforos.
+class TareaScraping:
+    """URL pendiente de scraping (registro liviano para la cola de trabajo).
     
-    Envuelve una tarea de scraping individual asegurando que se respeten
-    los límites de concurrencia global y por dominio.
+    Attributes:
+        fila: Índice de la fila en el DataFrame de productos.
+        tienda (str): Tienda de la URL.
+        url (str): URL del producto.
+        metodo (str): Nivel de precisión del match.
+        dominio (str): Dominio de la URL (clave de los límites por dominio).
+    """
+    
+    __slots__ = ('fila', 'tienda', 'url', 'metodo', 'dominio')
+    
+    def __init__(self, fila, tienda: str, url: str, metodo: str):
+        self.fila = fila
+        self.tienda = tienda
+        self.url = url
+        self.metodo = metodo
+        self.dominio = Utils.extraer_dominio(url)
+
+
+class ColaDominios:
+    """Cola acotada de tareas de scraping con una fila por dominio servida en round-robin.
+    
+    Un número fijo de trabajadores toma tareas con `tomar`, que solo entrega
+    una tarea cuando su dominio tiene cupo libre y además hay cupo global. Así
+    la memoria y el trabajo del planificador crecen con la concurrencia y no
+    con el tamaño del pedido.
+    
+    Attributes:
+        limite_global (int): Máximo de tareas activas en total.
+        limite_por_dominio (int): Máximo de tareas activas por dominio.
+        capacidad (int): Máximo de tareas en espera; `poner` bloquea al llegar a él.
+    """
+    
+    def __init__(self, limite_global: int, limite_por_dominio: int, capacidad: int):
+        self.limite_global = limite_global
+        self.limite_por_dominio = limite_por_dominio
+        self.capacidad = capacidad
+        self._pendientes = {}             # dominio -> deque de tareas en espera
+        self._ronda = deque()             # dominios con tareas, en orden round-robin
+        self._activos = defaultdict(int)  # dominio -> tareas activas
+        self._activos_global = 0
+        self._en_espera = 0
+        self._cerrada = False
+        self._cambio = asyncio.Condition()
+    
+    async def poner(self, tarea: TareaScraping):
+        """Agrega una tarea, esperando si la cola está llena."""
+        async with self._cambio:
+            await self._cambio.wait_for(lambda: self._en_espera < self.capacidad)
+            cola = self._pendientes.get(tarea.dominio)
+            if cola is None:
+                cola = self._pendientes[tarea.dominio] = deque()
+                self._ronda.append(tarea.dominio)
+            cola.append(tarea)
+            self._en_espera += 1
+            self._cambio.notify_all()
+    
+    def _siguiente(self) -> Optional[TareaScraping]:
+        if self._activos_global >= self.limite_global:
+            return None
+        for _ in range(len(self._ronda)):
+            dominio = self._ronda.popleft()
+            if self._activos[dominio] >= self.limite_por_dominio:
+                self._ronda.append(dominio)
+                continue
+            cola = self._pendientes[dominio]
+            tarea = cola.popleft()
+            if cola:
+                self._ronda.append(dominio)
+            else:
+                del self._pendientes[dominio]
+            self._activos[dominio] += 1
+            self._activos_global += 1
+            self._en_espera -= 1
+            return tarea
+        return None
+    
+    async def tomar(self) -> Optional[TareaScraping]:
+        """Entrega la siguiente tarea con cupo, o None si la cola se cerró y está vacía."""
+        async with self._cambio:
+            while True:
+                tarea = self._siguiente()
+                if tarea is not None:
+                    self._cambio.notify_all()
+                    return tarea
+                if self._cerrada and not self._en_espera:
+                    return None
+                await self._cambio.wait()
+    
+    async def liberar(self, dominio: str):
+        """Devuelve el cupo de una tarea terminada."""
+        async with self._cambio:
+            self._activos[dominio] -= 1
+            self._activos_global -= 1
+            self._cambio.notify_all()
+    
+    async def cerrar(self):
+        """Indica que no llegarán más tareas; los trabajadores terminan al vaciarse."""
+        async with self._cambio:
+            self._cerrada = True
+            self._cambio.notify_all()
+
+
+async def trabajador_scraping(scraper, cola: ColaDominios, publicar, cache=None):
+    """Toma tareas de la cola hasta que se cierre y publica cada resultado.
     
     Args:
-        sem_global (asyncio.Semaphore): Semáforo global para limitar pestañas totales.
-        sem_dominio (asyncio.Semaphore): Semáforo por dominio para limitar peticiones al mismo sitio.
         scraper (WebScraper): Instancia del scraper para procesar URLs.
-        tienda (str): Nombre de la tienda siendo procesada.
-        url (str): URL del producto a scrapear.
-        row_idx (int): Índice de la fila en el DataFrame de productos.
-        metodo_origen (str): Nivel de precisión del match ('Alta Precisión', 'Media Precisión', 'Baja Precisión').
+        cola (ColaDominios): Cola de tareas con límites por dominio.
+        publicar (callable): Recibe la tupla (tarea, marca, precio, error) de cada URL.
+        cache (CacheScraping, optional): Caché donde se guarda cada resultado.
+    """
+    while (tarea := await cola.tomar()) is not None:
+        try:
+            precio, marca, err = await scraper.procesar_url(tarea.url)
+        except Exception as e:
+            # Una página problemática no debe detener la búsqueda completa (error local: no se cachea)
+            precio, marca, err = 0, "Sin Marca", f"Local: {str(e)[:20]}"
+        finally:
+            await cola.liberar(tarea.dominio)
+        if cache is not None:
+            cache.guardar(tarea.url, tarea.tienda, precio, marca, err)
+        publicar((tarea, marca, precio, err))
+
+
+async def scrapear_cola(scraper, cola: ColaDominios, publicar, cache=None):
+    """Loop de scraping reutilizable: navegador propio y pool fijo de trabajadores.
+    
+    Inicia el scraper, ejecuta `cola.limite_global` trabajadores hasta que la
+    cola se cierre y quede vacía, y detiene el scraper al terminar (o al ser
+    cancelado). Lo usan el modo de un proceso y cada proceso del modo
+    multiproceso.
+    
+    Args:
+        scraper (WebScraper): Scraper sin iniciar; sus contadores quedan disponibles al terminar.
+        cola (ColaDominios): Cola de tareas alimentada por el llamador.
+        publicar (callable): Recibe la tupla (tarea, marca, precio, error) de cada URL.
+        cache (CacheScraping, optional): Caché donde se guarda cada resultado.
+    """
+    await scraper.start()
+    try:
+        await asyncio.gather(*(
+            trabajador_scraping(scraper, cola, publicar, cache)
+            for _ in range(cola.limite_global)
+        ))
+    finally:
+        await scraper.stop()
+
+
+def _combinar_estadisticas(lista: List[dict]) -> dict:
+    """Une las estadísticas de varios scrapers (cada dominio vive en un solo proceso)."""
+    total = {'contadores': defaultdict(int), 'bloqueos': defaultdict(int), 'bytes_ahorrados': 0,
+             'tiempos_listo': {}, 'parseo_parcial': {}, 'limitador': {}}
+    for estadisticas in lista:
+        for clave in ('contadores', 'bloqueos'):
+            for nombre, valor in estadisticas[clave].items():
+                total[clave][nombre] += valor
+        total['bytes_ahorrados'] += estadisticas['bytes_ahorrados']
+        for clave in ('tiempos_listo', 'parseo_parcial', 'limitador'):
+            total[clave].update(estadisticas[clave])
+    return total
+
+
+async def _servir_proceso(indice, entrada, salida, detener):
+    """Event loop de un proceso de scraping: lee tareas de `entrada` y envía resultados a `salida`."""
+    loop = asyncio.get_running_loop()
+    scraper = WebScraper()
+    cola = ColaDominios(Config.CONCURRENCIA_GLOBAL, Config.CONCURRENCIA_POR_TIENDA, Config.TAMANO_COLA_TAREAS)
+    
+    def siguiente_tarea():
+        # Espera con tope para que el hilo no quede bloqueado al detener el proceso
+        while not detener.is_set():
+            try:
+                return entrada.get(timeout=0.5)
+            except queue.Empty:
+                continue
+        return None
+    
+    async def leer_entrada():
+        while (tarea := await loop.run_in_executor(None, siguiente_tarea)) is not None:
+            await cola.poner(tarea)
+        await cola.cerrar()
+    
+    async def vigilar(scraping):
+        while not detener.is_set():
+            await asyncio.sleep(0.5)
+        scraping.cancel()
+    
+    lector = asyncio.create_task(leer_entrada())
+    scraping = asyncio.create_task(scrapear_cola(scraper, cola, lambda r: salida.send(('resultado', indice, r))))
+    vigia = asyncio.create_task(vigilar(scraping))
+    try:
+        await scraping
+    except asyncio.CancelledError:
+        pass
+    finally:
+        lector.cancel()
+        vigia.cancel()
+        salida.send(('fin', indice, scraper.estadisticas()))
+
+
+def _proceso_scraping(indice, entrada, salida, detener, configuracion: dict):
+    """Punto de entrada de cada proceso de scraping (modo multiproceso)."""
+    for nombre, valor in configuracion.items():
+        setattr(Config, nombre, valor)
+    asyncio.run(_servir_proceso(indice, entrada, salida, detener))
+
+
+class RepartidorProcesos:
+    """Reparte las tareas de scraping entre procesos, cada uno con su navegador.
+    
+    Actúa como coordinador: asigna cada dominio a un solo proceso (el que
+    tiene menos dominios), de modo que el límite por dominio se respeta tal
+    como en un proceso, y divide el límite global y el tamaño de la cola
+    entre los procesos. La cola de entrada de cada proceso es acotada:
+    `poner` espera (sin bloquear el event loop) mientras el proceso está
+    lleno. Los resultados vuelven por un pipe propio de cada proceso (un
+    proceso que muere a mitad de un envío no bloquea a los demás) y se
+    entregan a `al_recibir` en el event loop del proceso principal.
+    
+    Si un proceso termina sin enviar sus estadísticas (se cayó el navegador,
+    falta de memoria), se relanza con los mismos dominios y se le reenvían
+    sus tareas sin resultado. Tras `REINICIOS_MAXIMOS` caídas, sus tareas se
+    entregan con error y se cuentan en `perdidas`.
+    
+    Expone `poner`/`cerrar` igual que `ColaDominios`, para que el productor
+    de tareas no distinga entre modos.
+    
+    Attributes:
+        procesos (int): Cantidad de procesos de scraping.
+        al_recibir (callable): Recibe (tarea, marca, precio, error) por cada resultado.
+        log (callable): Recibe mensajes de estado (procesos caídos).
+        estadisticas (List[dict]): Estadísticas enviadas por cada proceso al terminar.
+        perdidas (int): URLs entregadas con error porque su proceso no se pudo recuperar.
+    """
+    
+    REINICIOS_MAXIMOS = 2
+    
+    def __init__(self, procesos: int, al_recibir, log=print):
+        self.procesos = procesos
+        self.al_recibir = al_recibir
+        self.log = log
+        self.estadisticas = []
+        self.perdidas = 0
+        self._contexto = multiprocessing.get_context('spawn')
+        self._detener = self._contexto.Event()
+        self._entradas = [None] * procesos
+        self._salidas = [None] * procesos     # extremo de lectura del pipe de resultados de cada proceso
+        self._fin_lectura = threading.Event()
+        self._procesos = [None] * procesos
+        self._reinicios = [0] * procesos
+        self._terminados = [False] * procesos  # envió sus estadísticas o se abandonó
+        self._bloqueos = [asyncio.Lock() for _ in range(procesos)]
+        self._asignacion = {}                 # dominio -> índice de proceso
+        self._dominios_por_proceso = [0] * procesos
+        self._en_curso = {}                   # URL -> (índice de proceso, tarea) enviada y sin resultado
+        self._cerrada = False
+        self._vigia = None
+        self._terminado = None
+        
+        configuracion = {nombre: getattr(Config, nombre) for nombre in dir(Config) if nombre.isupper()}
+        configuracion['CONCURRENCIA_GLOBAL'] = max(Config.CONCURRENCIA_POR_TIENDA,
+                                                   -(-Config.CONCURRENCIA_GLOBAL // procesos))
+        configuracion['TAMANO_COLA_TAREAS'] = max(1, -(-Config.TAMANO_COLA_TAREAS // procesos))
+        # Los núcleos de parseo se reparten entre los procesos (0 = cada uno parsea en línea)
+        parseo = Config.PROCESOS_PARSEO if Config.PROCESOS_PARSEO is not None else (os.cpu_count() or 1)
+        configuracion['PROCESOS_PARSEO'] = parseo // procesos
+        self._configuracion = configuracion
+    
+    def _lanzar(self, indice: int):
+        # No son daemon: cada uno crea su propio pool de parseo. Se detienen con `esperar`/`detener`.
+        entrada = self._contexto.Queue(maxsize=self._configuracion['CONCURRENCIA_GLOBAL'])
+        # Si el proceso muere con tareas sin leer, el hilo que escribe en la cola no debe
+        # bloquear la salida del intérprete (las tareas ya se reenviaron o se reportaron)
+        entrada.cancel_join_thread()
+        salida, escritura = self._contexto.Pipe(duplex=False)
+        proceso = self._contexto.Process(target=_proceso_scraping, daemon=False,
+                                         args=(indice, entrada, escritura, self._detener, self._configuracion))
+        proceso.start()
+        escritura.close()  # Solo el proceso escribe: al morir, el pipe entrega EOF
+        self._entradas[indice] = entrada
+        self._salidas[indice] = salida
+        self._procesos[indice] = proceso
+    
+    def iniciar(self):
+        """Lanza los procesos, el hilo que recibe sus resultados y la vigilancia de caídas."""
+        loop = asyncio.get_running_loop()
+        self._terminado = loop.create_future()
+        for indice in range(self.procesos):
+            self._lanzar(indice)
+        threading.Thread(target=self._leer_salida, args=(loop,), daemon=True).start()
+        self._vigia = asyncio.create_task(self._vigilar())
+    
+    def _leer_salida(self, loop):
+        cerradas = set()
+        while not self._fin_lectura.is_set():
+            abiertas = [salida for salida in self._salidas if salida is not None and salida not in cerradas]
+            for salida in multiprocessing.connection.wait(abiertas, timeout=0.5):
+                try:
+                    mensaje = salida.recv()
+                except (EOFError, OSError):
+                    # El proceso terminó; si se relanza, trae un pipe nuevo
+                    cerradas.add(salida)
+                    salida.close()
+                    continue
+                loop.call_soon_threadsafe(self._recibir, *mensaje)
+    
+    def _recibir(self, tipo: str, indice: int, dato):
+        if tipo == 'fin':
+            self.estadisticas.append(dato)
+            self._terminados[indice] = True
+            self._revisar_fin()
+        elif self._en_curso.pop(dato[0].url, None) is not None:
+            # Si la tarea se reenvió tras una caída, solo cuenta el primer resultado
+            self.al_recibir(dato)
+    
+    def _fallida(self, tarea: TareaScraping):
+        self._en_curso.pop(tarea.url, None)
+        self.perdidas += 1
+        self.al_recibir((tarea, "Sin Marca", 0, "Local: proceso caído"))
+    
+    def _revisar_fin(self):
+        if not self._cerrada or not all(self._terminados) or self._terminado.done():
+            return
+        for _, tarea in list(self._en_curso.values()):
+            self._fallida(tarea)
+        self._terminado.set_result(None)
+    
+    async def _vigilar(self):
+        """Revisa cada segundo si algún proceso terminó sin enviar sus estadísticas."""
+        while not self._detener.is_set():
+            await asyncio.sleep(1)
+            for indice in range(self.procesos):
+                proceso = self._procesos[indice]
+                # Código 0: terminó bien y sus estadísticas aún vienen en camino
+                if self._terminados[indice] or proceso.is_alive() or proceso.exitcode == 0:
+                    continue
+                async with self._bloqueos[indice]:
+                    await self._recuperar(indice, proceso.exitcode)
+    
+    async def _recuperar(self, indice: int, codigo: int):
+        pendientes = [tarea for i, tarea in self._en_curso.values() if i == indice]
+        if self._reinicios[indice] >= self.REINICIOS_MAXIMOS:
+            self.log(f"Proceso de scraping {indice + 1} terminó inesperadamente (código {codigo}):"
+                     f" {len(pendientes)} URLs quedan sin scrapear")
+            self._terminados[indice] = True
+            for tarea in pendientes:
+                self._fallida(tarea)
+            self._revisar_fin()
+            return
+        self._reinicios[indice] += 1
+        self.log(f"Proceso de scraping {indice + 1} terminó inesperadamente (código {codigo}):"
+                 f" se relanza con {len(pendientes)} URLs pendientes")
+        self._lanzar(indice)
+        for tarea in pendientes:
+            await self._enviar(indice, tarea)
+        if self._cerrada:
+            await self._enviar(indice, None)
+    
+    async def _enviar(self, indice: int, tarea: Optional[TareaScraping]):
+        """Pone la tarea (o None, fin de tareas) en la cola acotada del proceso."""
+        while True:
+            if self._terminados[indice]:
+                if tarea is not None:
+                    self._fallida(tarea)
+                return
+            try:
+                self._entradas[indice].put_nowait(tarea)
+                break
+            except queue.Full:
+                if not self._procesos[indice].is_alive():
+                    break  # Queda a cargo del proceso caído; `_vigilar` la reenvía
+                await asyncio.sleep(0.05)
+        if tarea is not None:
+            self._en_curso[tarea.url] = (indice, tarea)
+    
+    async def poner(self, tarea: TareaScraping):
+        """Envía la tarea al proceso dueño de su dominio (espera si su cola está llena)."""
+        indice = self._asignacion.get(tarea.dominio)
+        if indice is None:
+            indice = min(range(self.procesos), key=self._dominios_por_proceso.__getitem__)
+            self._asignacion[tarea.dominio] = indice
+            self._dominios_por_proceso[indice] += 1
+        await self._enviar(indice, tarea)
+    
+    async def cerrar(self):
+        """Indica a todos los procesos que no llegarán más tareas."""
+        self._cerrada = True
+        for indice in range(self.procesos):
+            async with self._bloqueos[indice]:
+                await self._enviar(indice, None)
+        self._revisar_fin()
+    
+    async def esperar(self) -> dict:
+        """Espera a que todos los procesos terminen y retorna sus estadísticas combinadas."""
+        try:
+            await self._terminado
+        finally:
+            await self._finalizar()
+        return _combinar_estadisticas(self.estadisticas)
+    
+    async def detener(self):
+        """Detiene los procesos (cierran su navegador) y termina los que no respondan."""
+        self._detener.set()
+        await self._finalizar()
+    
+    async def _finalizar(self):
+        if self._vigia is not None:
+            self._vigia.cancel()
+        await asyncio.get_running_loop().run_in_executor(None, self._unir)
+    
+    def finalizar(self):
+        """Detiene los procesos que sigan vivos (no requiere event loop; p. ej. tras un Ctrl+C)."""
+        if self._vigia is not None:
+            self._vigia.cancel()
+        if any(proceso is not None and proceso.is_alive() for proceso in self._procesos):
+            self._detener.set()
+        self._unir()
+    
+    def _unir(self, timeout: float = 15):
+        for proceso in self._procesos:
+            if proceso is None:
+                continue
+            proceso.join(timeout)
+            if proceso.is_alive():
+                proceso.terminate()
+        self._fin_lectura.set()
+
+
+async def trabajador_distribuido(ruta_cola: str, nombre: Optional[str] = None, callback_log=None,
+                                 stop_event=None) -> dict:
+    """Trabajador del modo distribuido: scrapea URLs de la cola compartida.
+    
+    Espera a que el coordinador abra una corrida en la cola, toma leases de
+    `Config.TAMANO_LEASE` URLs mientras tenga capacidad libre, las scrapea con
+    `scrapear_cola` y entrega cada resultado a la cola. Termina cuando la
+    corrida se da por terminada (o con `stop_event`) y devuelve a pendientes
+    las URLs que no alcanzó a entregar.
+    
+    Args:
+        ruta_cola (str): Archivo SQLite compartido con el coordinador.
+        nombre (str, optional): Identificador del trabajador (por defecto host-PID).
+        callback_log (callable, optional): Función callback(mensaje) para los mensajes de estado.
+        stop_event (threading.Event, optional): Evento para detener el trabajador.
     
     Returns:
-        tuple: (row_idx, tienda, url, marca, precio, error, metodo_origen)
+        dict: Estadísticas del scraper (ver `WebScraper.estadisticas`).
     """
-    async with sem_global:
-        async with sem_dominio:
-            await asyncio.sleep(random.uniform(0.5, 2.0))
-            precio, marca, err = await scraper.procesar_url(url)
-            return row_idx, tienda, url, marca, precio, err, metodo_origen
+    log = callback_log or print
+    nombre = nombre or ColaLeases.nombre_trabajador()
+    cola_leases = ColaLeases(ruta_cola)
+    scraper = WebScraper()
+    # En el trabajador, `TareaScraping.fila` guarda el id de la tarea en la cola compartida
+    cola = ColaDominios(Config.CONCURRENCIA_GLOBAL, Config.CONCURRENCIA_POR_TIENDA, Config.TAMANO_COLA_TAREAS)
+    en_curso = 0
+    entregadas = 0
+    
+    def entregar(resultado):
+        nonlocal en_curso, entregadas
+        tarea, marca, precio, err = resultado
+        cola_leases.entregar(tarea.fila, marca, precio, err, nombre)
+        en_curso -= 1
+        entregadas += 1
+    
+    async def alimentar(scraping):
+        """Toma leases mientras la corrida siga abierta; al salir detiene el scraping."""
+        nonlocal en_curso
+        corrida = None
+        try:
+            while not (stop_event and stop_event.is_set()):
+                abierta = cola_leases.corrida_abierta()
+                if corrida is None and abierta:
+                    corrida = abierta
+                    log(f"Trabajador {nombre}: conectado a la corrida {corrida[:8]}")
+                elif corrida is not None and abierta != corrida:
+                    break  # El coordinador terminó (o inició otra corrida)
+                if corrida is not None:
+                    cola_leases.latir(nombre)
+                    if en_curso < Config.CONCURRENCIA_GLOBAL:
+                        lease = cola_leases.tomar_lease(nombre, Config.TAMANO_LEASE)
+                        for id_tarea, tienda, url, metodo in lease:
+                            en_curso += 1
+                            await cola.poner(TareaScraping(id_tarea, tienda, url, metodo))
+                        if lease:
+                            continue
+                await asyncio.sleep(Config.INTERVALO_SONDEO_S)
+        finally:
+            scraping.cancel()
+    
+    scraping = asyncio.create_task(scrapear_cola(scraper, cola, entregar))
+    alimentador = asyncio.create_task(alimentar(scraping))
+    try:
+        await asyncio.wait({scraping})
+        if not scraping.cancelled():
+            scraping.result()
+    finally:
+        alimentador.cancel()
+        scraping.cancel()
+        await asyncio.gather(alimentador, scraping, return_exceptions=True)
+        cola_leases.liberar(nombre)
+        cola_leases.cerrar()
+    
+    log(f"Trabajador {nombre}: {entregadas} URLs entregadas")
+    estadisticas = scraper.estadisticas()
+    _registrar_estadisticas(log, estadisticas)
+    return estadisticas
+
+
+def _registrar_estadisticas(log, estadisticas: dict):
+    """Escribe en el log los contadores del scraping (ver `WebScraper.estadisticas`)."""
+    contadores = estadisticas['contadores']
+    if contadores['http_directo'] or contadores['http_a_navegador']:
+        log(f"HTTP directo: {contadores['http_directo']} páginas, "
+            f"{contadores['http_a_navegador']} derivadas al navegador")
+    if estadisticas['bloqueos']:
+        detalle = ", ".join(f"{motivo}: {n}" for motivo, n in sorted(estadisticas['bloqueos'].items()))
+        log(f"Recursos bloqueados: {sum(estadisticas['bloqueos'].values())} peticiones "
+            f"(~{estadisticas['bytes_ahorrados'] / 1_048_576:.1f} MB ahorrados) -> {detalle}")
+    if contadores['extraccion_en_pagina']:
+        log(f"Extracción en la página (sin page.content): {contadores['extraccion_en_pagina']} páginas")
+    for dominio, (esperas, total_ms, maximo_ms, agotadas) in estadisticas['tiempos_listo'].items():
+        log(f"Página lista {dominio}: media {total_ms / esperas:.0f} ms, máx {maximo_ms:.0f} ms, "
+            f"{agotadas}/{esperas} agotaron el tope")
+    for dominio, (parciales, candidatas) in estadisticas['parseo_parcial'].items():
+        log(f"Parseo parcial {dominio}: {parciales}/{candidatas} páginas "
+            f"({parciales / candidatas:.0%}) resueltas con datos estructurados")
+    if estadisticas['limitador']:
+        log("Estado del limitador por dominio:")
+    for dominio, estado in estadisticas['limitador'].items():
+        log(f"{dominio}: {estado['tasa']} req/s, {estado['exitos']} ok, {estado['errores']} errores, "
+            f"{estado['limitados']} limitados, {estado['latencia_media']}s -> {estado['motivo']}")
+
+
+def _escribir_resultado(df, ruta):
+    """Escribe el DataFrame de resultados según la extensión (.xlsx, .csv o .json)."""
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension == '.csv':
+        df.to_csv(ruta, index=False, encoding='utf-8-sig')
+    elif extension == '.json':
+        df.to_json(ruta, orient='records', force_ascii=False, indent=1)
+    else:
+        df.to_excel(ruta, index=False)
+
 
+def _guardar_excel(df, ruta):
+    """Escribe un DataFrame de resultados ignorando errores (usado en segundo plano)."""
+    try:
+        _escribir_resultado(df, ruta)
+    except Exception:
+        pass
 
-async def main(callback_log=None, callback_progress=None, stop_event=None):
+
+def carpeta_raiz() -> str:
+    """Carpeta de trabajo por defecto (junto al ejecutable o la raíz del repositorio)."""
+    if getattr(sys, 'frozen', False):
+        return os.path.dirname(sys.executable)
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+async def main(callback_log=None, callback_progress=None, stop_event=None, reanudar=False,
+               forzar_actualizacion=False, ruta_productos=None, ruta_resultado=None, carpeta_tiendas=None):
     """Orquestador principal del motor EasyFind.
     
     Carga bases de datos de tiendas, realiza coincidencia de doble precisión
     para encontrar productos y hace scraping concurrente de URLs para
     extraer precios y marcas. Genera archivos Excel con los resultados.
+    Cada resultado se agrega además a la bitácora `Config.ARCHIVO_BITACORA`
+    apenas llega; la bitácora se borra cuando la búsqueda termina completa.
     
     Args:
         callback_log (callable, optional): Función callback(mensaje) para enviar mensajes de log a la GUI.
         callback_progress (callable, optional): Función callback(actual, total) para actualizar la barra de progreso.
         stop_event (threading.Event, optional): Evento para detener el proceso de forma segura desde la GUI.
+        reanudar (bool): Si es True, carga los resultados de la bitácora de una ejecución
+            anterior del mismo pedido y solo scrapea las celdas (fila, tienda) faltantes.
+        forzar_actualizacion (bool): Si es True ignora la caché de scraping
+            (`Config.ARCHIVO_CACHE_SCRAPING`) y vuelve a consultar todas las URLs.
+        ruta_productos (str, optional): Archivo de productos (.xlsx o .csv). Por defecto
+            PRODUCTOS.xlsx o PRODUCTOS.csv en la carpeta raíz.
+        ruta_resultado (str, optional): Archivo de salida; el formato se toma de la extensión
+            (.xlsx, .csv o .json). Por defecto Resultado.xlsx en la carpeta raíz. Con una ruta
+            propia, la bitácora y el guardado parcial usan su mismo nombre base
+            (ej: salida_Parcial.jsonl), de modo que varias ejecuciones no se pisen.
+        carpeta_tiendas (str, optional): Carpeta de catálogos. Por defecto `Config.CARPETA_TIENDAS`.
+    
+    Returns:
+        Optional[str]: Ruta del archivo de resultados escrito, o None si la búsqueda no
+            llegó a generarlo (error o archivos de entrada faltantes).
     """
     
     def log(mensaje):
@@ -66,10 +628,7 @@ async def main(callback_log=None, callback_progress=None, stop_event=None):
             msg_limpio = str(mensaje).replace("\n", "")
             callback_log(msg_limpio)
 
-    if getattr(sys, 'frozen', False):
-        carpeta_root = os.path.dirname(sys.executable)
-    else:
-        carpeta_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    carpeta_root = carpeta_raiz()
     
     # Actualizar tasa del dólar globalmente
     _config_module.TASA_DOLAR = Config.obtener_dolar_oficial()
@@ -79,28 +638,46 @@ async def main(callback_log=None, callback_progress=None, stop_event=None):
     else:
         log(f"--- Iniciando EasyFind (modo legacy) ---")
     
-    scraper = WebScraper()
-    await scraper.start()
+    # Rutas de salida: la bitácora y el guardado parcial acompañan al resultado
+    if ruta_resultado:
+        os.makedirs(os.path.dirname(os.path.abspath(ruta_resultado)), exist_ok=True)
+        base_salida = os.path.splitext(ruta_resultado)[0]
+        ruta_bitacora = base_salida + "_Parcial.jsonl"
+    else:
+        ruta_resultado = os.path.join(carpeta_root, "Resultado.xlsx")
+        base_salida = os.path.splitext(ruta_resultado)[0]
+        ruta_bitacora = os.path.join(carpeta_root, Config.ARCHIVO_BITACORA)
+    extension_salida = os.path.splitext(ruta_resultado)[1] or ".xlsx"
+    nombre_salida = os.path.basename(ruta_resultado)
+    
+    journal = ResultJournal(ruta_bitacora)
+    cache = CacheScraping(os.path.join(carpeta_root, Config.ARCHIVO_CACHE_SCRAPING), forzar_actualizacion)
+    cola = None
+    error_scraping = None
     
     try:
         log("Cargando bases de datos de TIENDAS")
-        df_db = DataManager.cargar_bases_datos(os.path.join(carpeta_root, Config.CARPETA_TIENDAS))
+        df_db = DataManager.cargar_bases_datos(carpeta_tiendas or os.path.join(carpeta_root, Config.CARPETA_TIENDAS))
         if df_db.empty: 
             log("Error: Sin bases de datos en la carpeta TIENDAS.")
             return
 
         # Cargar archivo de Productos
         try:
-            ruta_xlsx = os.path.join(carpeta_root, "PRODUCTOS.xlsx")
-            ruta_csv = os.path.join(carpeta_root, "PRODUCTOS.csv")
-            
-            if os.path.exists(ruta_xlsx):
-                df_pedido = pd.read_excel(ruta_xlsx)
-            elif os.path.exists(ruta_csv):
-                df_pedido = pd.read_csv(ruta_csv)
+            if ruta_productos:
+                candidatos = [ruta_productos]
             else:
-                log("No se encontró PRODUCTOS.xlsx ni PRODUCTOS.csv")
+                candidatos = [os.path.join(carpeta_root, "PRODUCTOS.xlsx"), os.path.join(carpeta_root, "PRODUCTOS.csv")]
+            ruta_pedido = next((r for r in candidatos if os.path.exists(r)), None)
+            
+            if ruta_pedido is None:
+                log(f"No se encontró {ruta_productos}" if ruta_productos
+                    else "No se encontró PRODUCTOS.xlsx ni PRODUCTOS.csv")
                 return
+            if ruta_pedido.lower().endswith('.csv'):
+                df_pedido = pd.read_csv(ruta_pedido)
+            else:
+                df_pedido = DataManager.leer_excel(ruta_pedido)
         except Exception as e:
             log(f"Error leyendo archivo de productos: {e}")
             return
@@ -117,117 +694,216 @@ async def main(callback_log=None, callback_progress=None, stop_event=None):
                 if f"{t} {campo}" not in df_pedido.columns:
                     df_pedido[f"{t} {campo}"] = ""
 
-        # --- FASE 1: GENERACIÓN DE TAREAS DUALES ---
+        # --- REANUDACIÓN DESDE LA BITÁCORA ---
+        productos = df_pedido[col_desc].astype(str).tolist()
+        huella_pedido = ResultJournal.huella(productos)
+        completados_previos = journal.cargar(huella_pedido) if reanudar else None
+        if reanudar and completados_previos is None:
+            log("No hay una bitácora válida para este pedido. Se inicia desde cero.")
+        for (fila, tienda), registro in (completados_previos or {}).items():
+            if fila in df_pedido.index and tienda in tiendas:
+                df_pedido.at[fila, f"{tienda} Link"] = registro['link']
+                df_pedido.at[fila, f"{tienda} Marca"] = registro['marca']
+                df_pedido.at[fila, f"{tienda} Precio"] = registro['precio']
+        if completados_previos:
+            log(f"Reanudando: {len(completados_previos)} resultados recuperados de la bitácora")
+
+        # --- FASE 1 + 2: MATCHING Y SCRAPING EN PARALELO ---
+        # El matching corre por bloques de productos en un executor y cada URL
+        # encontrada entra de inmediato a la cola de scraping, de modo que el
+        # navegador trabaja mientras el matching continúa. Un número fijo de
+        # trabajadores consume la cola, en este proceso, repartidos en
+        # Config.PROCESOS_SCRAPING procesos con su propio navegador o en
+        # trabajadores distribuidos (Config.COLA_DISTRIBUIDA).
         log(f"⚙️ Analizando {len(df_pedido)} productos")
         
-        tareas_pendientes = []
-        
-        # Inicializar Semáforos
-        sem_global = asyncio.Semaphore(Config.CONCURRENCIA_GLOBAL)
-        sems_dominio = defaultdict(lambda: asyncio.Semaphore(Config.CONCURRENCIA_POR_TIENDA))
+        destinos_url = {}    # URL normalizada -> [(fila, tienda, url, método), ...] en espera
+        resultados_url = {}  # URL normalizada -> (marca, precio, error) ya scrapeada
         
         cache_tiendas = {t: df_db[df_db['Tienda'] == t] for t in tiendas}
+        indices_tiendas = {t: DataManager.obtener_indice(cache_tiendas[t]) for t in tiendas} if RAPIDFUZZ_DISPONIBLE else {}
 
         count_alta = 0
         count_media = 0
         count_baja = 0
         count_fail = 0
+        total_tareas = 0
+        completados = 0
+        ultimo_guardado = 0
+        guardado_parcial = None
+        loop = asyncio.get_running_loop()
+        cola_resultados = asyncio.Queue()
+        estadisticas = None
+        
+        def recibir_resultado(resultado):
+            """Resultado de un scraping externo (otro proceso o trabajador distribuido)."""
+            tarea, marca, precio, err = resultado
+            cache.guardar(tarea.url, tarea.tienda, precio, marca, err)
+            cola_resultados.put_nowait(resultado)
+        
+        if Config.COLA_DISTRIBUIDA:
+            ruta_cola = Config.COLA_DISTRIBUIDA
+            cola = CoordinadorLeases(ruta_cola, recibir_resultado, log)
+            log(f"Modo distribuido: URLs en {ruta_cola}, esperando trabajadores")
+        elif Config.PROCESOS_SCRAPING > 1:
+            cola = RepartidorProcesos(Config.PROCESOS_SCRAPING, recibir_resultado, log)
+            log(f"Scraping repartido en {Config.PROCESOS_SCRAPING} procesos")
+        else:
+            cola = ColaDominios(Config.CONCURRENCIA_GLOBAL, Config.CONCURRENCIA_POR_TIENDA, Config.TAMANO_COLA_TAREAS)
+        scraping_externo = not isinstance(cola, ColaDominios)
+        if scraping_externo:
+            cola.iniciar()
+        journal.abrir(reiniciar=not completados_previos, huella=huella_pedido)
 
-        for idx, row in df_pedido.iterrows():
-            producto = str(row[col_desc])
+        def escribir_resultado(row_idx, tienda, url_final, marca, precio, err):
+            """Aplica las reglas de IVA y login, escribe la celda y la registra en la bitácora."""
+            precio_final = 0
+            es_tienda_login = tienda in Config.TIENDAS_SOLO_MARCA
+
+            if precio > 0:
+                if tienda in Config.TIENDAS_CON_IVA:
+                    precio_final = int(precio / 1.19)
+                else:
+                    precio_final = precio
             
-            for tienda in tiendas:
-                df_subset = cache_tiendas[tienda]
-                
-                # 1. INTENTO ALTA PRECISIÓN
-                url_final, _ = DataManager.buscar_match_alta_precision(producto, df_subset)
-                metodo = "Alta Precisión"
-
-                # 2. INTENTO MEDIA PRECISIÓN
-                if not url_final:
-                    url_final, _ = DataManager.buscar_match_media_precision(producto, df_subset)
-                    metodo = "Media Precisión"
-                
-                # 3. INTENTO BAJA PRECISIÓN
-                if not url_final:
-                    url_final, _ = DataManager.buscar_match_baja_precision(producto, df_subset)
-                    metodo = "Baja Precisión"
-                
-                # 4. RESULTADO
-                if url_final:
-                    dominio_base = url_final.split('/')[2] if '//' in url_final else 'generic'
-                    t = procesar_tarea_segura(
-                        sem_global, 
-                        sems_dominio[dominio_base], 
-                        scraper, 
-                        tienda, 
-                        url_final, 
-                        idx,
-                        metodo
-                    )
-                    tareas_pendientes.append(t)
+            if precio_final > 0:
+                valor_para_excel = precio_final
+                tag_log = f"$ {precio_final:,.0f}"
+            elif es_tienda_login:
+                valor_para_excel = Config.TEXTO_LOGIN
+                tag_log = "Login Req"
+            else:
+                valor_para_excel = Config.TEXTO_ERROR
+                tag_log = "No detectado"
+            
+            if err: tag_log += f" ({err})"
+
+            df_pedido.at[row_idx, f"{tienda} Link"] = url_final
+            df_pedido.at[row_idx, f"{tienda} Marca"] = marca
+            df_pedido.at[row_idx, f"{tienda} Precio"] = valor_para_excel
+            journal.registrar(row_idx, tienda, url_final, marca, valor_para_excel)
+            return tag_log
+
+        async def producir_tareas():
+            """Matching por bloques de productos; encola una tarea por URL nueva."""
+            nonlocal count_alta, count_media, count_baja, count_fail, total_tareas
+            filas = list(df_pedido.index)
+            try:
+                for inicio in range(0, len(filas), Config.TAMANO_BLOQUE_MATCHING):
+                    if stop_event and stop_event.is_set():
+                        break
+                    bloque_filas = filas[inicio:inicio + Config.TAMANO_BLOQUE_MATCHING]
+                    bloque_productos = productos[inicio:inicio + Config.TAMANO_BLOQUE_MATCHING]
                     
-                    if metodo == "Alta Precisión": count_alta += 1
-                    elif metodo == "Media Precisión": count_media += 1
-                    else: count_baja += 1
+                    # 1. MATCHING POR LOTES (bloque de productos contra cada tienda)
+                    matches_tiendas = {}
+                    for tienda in tiendas:
+                        matches_tiendas[tienda] = await loop.run_in_executor(
+                            None, DataManager.buscar_match_lote,
+                            bloque_productos, cache_tiendas[tienda], indices_tiendas.get(tienda)
+                        )
+                    
+                    for pos, idx in enumerate(bloque_filas):
+                        for tienda in tiendas:
+                            if completados_previos and (idx, tienda) in completados_previos:
+                                continue
+                            url_final, _, _, metodo = matches_tiendas[tienda][pos]
+                            
+                            # 2. RESULTADO (una sola tarea por URL; las filas repetidas se agregan como destinos)
+                            if url_final:
+                                if metodo == DataManager.PRECISION_ALTA: count_alta += 1
+                                elif metodo == DataManager.PRECISION_MEDIA: count_media += 1
+                                else: count_baja += 1
+                                
+                                clave_url = Utils.normalizar_url(url_final)
+                                if clave_url in resultados_url:
+                                    escribir_resultado(idx, tienda, url_final, *resultados_url[clave_url])
+                                elif clave_url in destinos_url:
+                                    destinos_url[clave_url].append((idx, tienda, url_final, metodo))
+                                else:
+                                    destinos_url[clave_url] = [(idx, tienda, url_final, metodo)]
+                                    total_tareas += 1
+                                    tarea = TareaScraping(idx, tienda, url_final, metodo)
+                                    cacheado = cache.obtener(url_final, tienda)
+                                    if cacheado is not None:
+                                        precio, marca, err = cacheado
+                                        cola_resultados.put_nowait((tarea, marca, precio, err))
+                                    else:
+                                        await cola.poner(tarea)
+                            else:
+                                # Escribir directamente "Link no encontrado"
+                                df_pedido.at[idx, f"{tienda} Link"] = Config.TEXTO_SIN_LINK
+                                df_pedido.at[idx, f"{tienda} Precio"] = Config.TEXTO_SIN_LINK
+                                df_pedido.at[idx, f"{tienda} Marca"] = "-"
+                                count_fail += 1
+            finally:
+                await cola.cerrar()
+
+            log(f"Resumen de Búsqueda en DB:")
+            log(f"Alta Precisión: {count_alta}")
+            log(f"Media Precisión: {count_media}")
+            log(f"Baja Precisión: {count_baja}")
+            log(f"No encontrados: {count_fail}")
+            scrapes_evitados = count_alta + count_media + count_baja - total_tareas
+            if scrapes_evitados:
+                log(f"URLs duplicadas: {scrapes_evitados} scrapes evitados")
+            log(f"Matching terminado: {total_tareas} URLs en scraping")
+
+        async def ejecutar_scraping():
+            """Scraping en este proceso, en los del repartidor o en los trabajadores; publica None al terminar."""
+            nonlocal estadisticas
+            try:
+                if scraping_externo:
+                    try:
+                        estadisticas = await cola.esperar()
+                    except asyncio.CancelledError:
+                        await cola.detener()
+                        raise
                 else:
-                    # Escribir directamente "Link no encontrado"
-                    df_pedido.at[idx, f"{tienda} Link"] = Config.TEXTO_SIN_LINK
-                    df_pedido.at[idx, f"{tienda} Precio"] = Config.TEXTO_SIN_LINK
-                    df_pedido.at[idx, f"{tienda} Marca"] = "-"
-                    count_fail += 1
-
-        log(f"Resumen de Búsqueda en DB:")
-        log(f"Alta Precisión: {count_alta}")
-        log(f"Media Precisión: {count_media}")
-        log(f"Baja Precisión: {count_baja}")
-        log(f"No encontrados: {count_fail}")
-        log(f"Iniciando scraping de {len(tareas_pendientes)} URLs...")
-        
-        # --- FASE 2: EJECUCIÓN ASÍNCRONA ---
-        total_tareas = len(tareas_pendientes)
-        completados = 0
-        ultimo_guardado = 0
-        
-        if total_tareas > 0:
-            for corrutina in asyncio.as_completed(tareas_pendientes):
+                    scraper = WebScraper()
+                    try:
+                        await scrapear_cola(scraper, cola, cola_resultados.put_nowait, cache)
+                    finally:
+                        estadisticas = scraper.estadisticas()
+            finally:
+                cola_resultados.put_nowait(None)
+
+        async def siguiente_resultado():
+            """Siguiente resultado; revisa la detención cada medio segundo aunque no lleguen resultados."""
+            try:
+                return cola_resultados.get_nowait()
+            except asyncio.QueueEmpty:
+                return await asyncio.wait_for(cola_resultados.get(), timeout=0.5)
+
+        productor = asyncio.create_task(producir_tareas())
+        trabajadores = asyncio.create_task(ejecutar_scraping())
+        try:
+            while True:
                 
                 # VERIFICACIÓN DE DETENCIÓN 
                 if stop_event and stop_event.is_set():
                     log("Proceso detenido por el usuario.")
                     break 
                 
-                row_idx, tienda, url_final, marca, precio, err, metodo_usado = await corrutina
-                
-                # Reglas de IVA y Login
-                precio_final = 0
-                es_tienda_login = tienda in Config.TIENDAS_SOLO_MARCA
-
-                if precio > 0:
-                    if tienda in Config.TIENDAS_CON_IVA:
-                        precio_final = int(precio / 1.19)
-                    else:
-                        precio_final = precio
+                try:
+                    resultado = await siguiente_resultado()
+                except asyncio.TimeoutError:
+                    continue
+                if resultado is None:
+                    # Propagar errores del scraping primero: si falló (p. ej. sin navegador) el
+                    # productor puede quedar esperando cupo en la cola y se cancela en el finally
+                    if not trabajadores.cancelled():
+                        error_scraping = trabajadores.exception()
+                    await trabajadores
+                    await productor
+                    break
                 
-                valor_para_excel = ""
-                tag_log = ""
-
-                if precio_final > 0:
-                    valor_para_excel = precio_final
-                    tag_log = f"$ {precio_final:,.0f}"
-                elif es_tienda_login:
-                    valor_para_excel = Config.TEXTO_LOGIN
-                    tag_log = "Login Req"
-                else:
-                    valor_para_excel = Config.TEXTO_ERROR
-                    tag_log = "No detectado"
+                tarea, marca, precio, err = resultado
+                clave_url = Utils.normalizar_url(tarea.url)
+                resultados_url[clave_url] = (marca, precio, err)
                 
-                if err: tag_log += f" ({err})"
-
-                # Escribir en DF 
-                df_pedido.at[row_idx, f"{tienda} Link"] = url_final
-                df_pedido.at[row_idx, f"{tienda} Marca"] = marca
-                df_pedido.at[row_idx, f"{tienda} Precio"] = valor_para_excel
+                for row_idx, tienda, url_final, metodo_usado in destinos_url.pop(clave_url):
+                    tag_log = escribir_resultado(row_idx, tienda, url_final, marca, precio, err)
 
                 completados += 1
                 
@@ -235,33 +911,59 @@ async def main(callback_log=None, callback_progress=None, stop_event=None):
                 if callback_progress:
                     callback_progress(completados, total_tareas)
 
-                if completados % 5 == 0 or completados == total_tareas:
+                if completados % 5 == 0 or (productor.done() and completados == total_tareas):
                     log(f"[{completados}/{total_tareas}] {tienda} ({metodo_usado}) -> {tag_log}")
 
-                # Guardado Parcial
+                # Guardado Parcial: la bitácora ya persiste cada resultado; el Excel
+                # parcial se escribe en segundo plano sin bloquear el event loop.
                 if completados - ultimo_guardado >= Config.TAMANO_LOTE_GUARDADO:
-                    try:
-                        df_pedido.to_excel(os.path.join(carpeta_root, "Resultado_Parcial.xlsx"), index=False)
+                    if guardado_parcial is None or guardado_parcial.done():
+                        guardado_parcial = loop.run_in_executor(
+                            None, _guardar_excel, df_pedido.copy(),
+                            base_salida + "_Parcial" + extension_salida
+                        )
                         ultimo_guardado = completados
-                    except: pass
+        finally:
+            productor.cancel()
+            trabajadores.cancel()
+            await asyncio.gather(productor, trabajadores, return_exceptions=True)
+
+        if guardado_parcial is not None:
+            await guardado_parcial
+
+        log(f"Caché de scraping: {cache.aciertos} aciertos, {cache.fallos} fallos"
+            + (" (actualización forzada)" if forzar_actualizacion else ""))
+        if estadisticas:
+            _registrar_estadisticas(log, estadisticas)
 
         # Guardado Final
-        output = os.path.join(carpeta_root, "Resultado.xlsx")
-        df_pedido.to_excel(output, index=False)
+        _escribir_resultado(df_pedido, ruta_resultado)
         
         if stop_event and stop_event.is_set():
-            log(f"Proceso detenido. Se guardó lo avanzado en: Resultado.xlsx")
+            log(f"Proceso detenido. Se guardó lo avanzado en: {nombre_salida}")
         else:
-            log(f"Busqueda terminada. Archivo guardado: Resultado.xlsx")
+            # Búsqueda completa: la bitácora solo sirve para reanudar una búsqueda interrumpida
+            journal.eliminar()
+            if getattr(cola, 'perdidas', 0):
+                log(f"Busqueda terminada con {cola.perdidas} URLs sin scrapear (proceso caído). Archivo guardado: {nombre_salida}")
+            else:
+                log(f"Busqueda terminada. Archivo guardado: {nombre_salida}")
+        return ruta_resultado
 
     except KeyboardInterrupt:
         log("Interrumpido por usuario.")
         try:
-            df_pedido.to_excel(os.path.join(carpeta_root, "Resultado_Interrumpido.xlsx"), index=False)
+            _escribir_resultado(df_pedido, base_salida + "_Interrumpido" + extension_salida)
         except: pass
     except Exception as e:
         log(f"Error General: {e}")
+        if e is error_scraping:
+            raise  # El scraping no pudo correr (p. ej. navegador no instalado): error para quien llamó
         import traceback
         traceback.print_exc()
     finally:
-        await scraper.stop()
+        # Si la búsqueda se interrumpió antes de detenerlos, no deja procesos ni una corrida distribuida abierta
+        if cola is not None and not isinstance(cola, ColaDominios):
+            cola.finalizar()
+        journal.cerrar()
+        cache.cerrar()
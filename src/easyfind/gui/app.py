@@ -15,6 +15,7 @@ import time
 import tkinter as tk
 from tkinter import scrolledtext, messagebox, ttk
 
+from ..config import Config
 from ..engine import main as easyfind_main
 from .system_utils import BotManager
 from .dialogs import StoreSelectionDialog
@@ -320,10 +321,16 @@ class EasyFindApp:
             messagebox.showerror("Error", "Falta archivo PRODUCTOS.xlsx/csv")
             return
         
+        reanudar = False
+        if os.path.exists(Config.ARCHIVO_BITACORA):
+            reanudar = messagebox.askyesno(
+                "Reanudar",
+                "Hay resultados de una búsqueda anterior.\n¿Reanudar sin volver a consultar lo ya procesado?")
+        
         self._reset_ui("BÚSQUEDA DE PRECIOS")
-        threading.Thread(target=self._run_search_thread, daemon=True).start()
+        threading.Thread(target=self._run_search_thread, args=(reanudar,), daemon=True).start()
 
-    def _run_search_thread(self):
+    def _run_search_thread(self, reanudar=False):
         """Hilo en segundo plano para ejecutar la lógica de búsqueda de precios."""
         error = False
         try:
@@ -335,7 +342,8 @@ class EasyFindApp:
             asyncio.run(easyfind_main(
                 callback_log=_log_cb, 
                 callback_progress=_prog_cb, 
-                stop_event=self.stop_event
+                stop_event=self.stop_event,
+                reanudar=reanudar
             ))
         except Exception as e:
             error = True
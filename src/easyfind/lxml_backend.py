@@ -0,0 +1,174 @@
+"""
+Backend de parseo HTML basado en lxml (libxml2, en C).
+
+Expone sobre un árbol lxml el subconjunto de la API de BeautifulSoup que usan
+`ContentParser` y `StoreStrategies` (select/select_one, find/find_all,
+get_text, string, parent, find_next_sibling, acceso a atributos), de modo que
+las mismas estrategias de extracción funcionan con cualquiera de los dos
+backends.
+"""
+
+from functools import lru_cache
+
+import lxml.html
+
+
+@lru_cache(maxsize=256)
+def _selector(css: str):
+    """Compila (una sola vez) un selector CSS a XPath."""
+    from lxml.cssselect import CSSSelector
+    return CSSSelector(css, translator='html')
+
+
+def _es_comentario(el) -> bool:
+    return not isinstance(el.tag, str)
+
+
+def _coincide_nombre(el, nombre) -> bool:
+    if nombre is None:
+        return isinstance(el.tag, str)
+    if isinstance(nombre, (list, tuple, set)):
+        return el.tag in nombre
+    return el.tag == nombre
+
+
+class TextoLxml(str):
+    """Cadena de texto del documento con referencia a su nodo padre.
+
+    Equivale a un NavigableString de BeautifulSoup.
+    """
+
+    def __new__(cls, texto: str, padre):
+        obj = super().__new__(cls, texto)
+        obj._padre = padre
+        return obj
+
+    @property
+    def parent(self):
+        return NodoLxml(self._padre) if self._padre is not None else None
+
+
+class NodoLxml:
+    """Elemento lxml con la API de BeautifulSoup usada por las estrategias.
+
+    Attributes:
+        el: Elemento lxml envuelto.
+    """
+
+    __slots__ = ('el',)
+
+    def __init__(self, el):
+        self.el = el
+
+    @classmethod
+    def desde_html(cls, html: str) -> "NodoLxml":
+        """Parsea un documento HTML completo y retorna su nodo raíz."""
+        parser = lxml.html.HTMLParser(encoding='utf-8')
+        return cls(lxml.html.document_fromstring(html.encode('utf-8', 'replace'), parser=parser))
+
+    def __bool__(self):
+        # Igual que un Tag de BeautifulSoup: un nodo existente siempre es verdadero
+        return True
+
+    def __repr__(self):
+        return f"<NodoLxml {self.name}>"
+
+    # --- Identidad y atributos ---
+
+    @property
+    def name(self) -> str:
+        return self.el.tag if isinstance(self.el.tag, str) else 'comment'
+
+    @property
+    def parent(self):
+        padre = self.el.getparent()
+        return NodoLxml(padre) if padre is not None else None
+
+    def get(self, atributo: str, default=None):
+        return self.el.get(atributo, default)
+
+    def __getitem__(self, atributo: str):
+        valor = self.el.get(atributo)
+        if valor is None:
+            raise KeyError(atributo)
+        return valor
+
+    def has_attr(self, atributo: str) -> bool:
+        return atributo in self.el.attrib
+
+    # --- Texto ---
+
+    def _cadenas_visibles(self, el):
+        """Textos incluidos por get_text (sin comentarios, scripts ni estilos)."""
+        if not _es_comentario(el) and el.tag not in ('script', 'style') and el.text:
+            yield el.text
+        for hijo in el:
+            if not _es_comentario(hijo):
+                yield from self._cadenas_visibles(hijo)
+            if hijo.tail:
+                yield hijo.tail
+
+    def get_text(self, separator: str = "", strip: bool = False) -> str:
+        textos = self._cadenas_visibles(self.el)
+        if strip:
+            textos = (t.strip() for t in textos)
+            textos = (t for t in textos if t)
+        return separator.join(textos)
+
+    @property
+    def string(self):
+        el = self.el
+        while True:
+            hijos = list(el)
+            if not hijos:
+                return TextoLxml(el.text, el) if el.text is not None else None
+            if len(hijos) > 1 or el.text or hijos[0].tail:
+                return None
+            el = hijos[0]
+
+    def _cadenas(self, el):
+        """Todas las cadenas del subárbol en orden de documento (como NavigableString)."""
+        if _es_comentario(el):
+            if el.text:
+                yield TextoLxml(el.text, el.getparent())
+            return
+        if el.text:
+            yield TextoLxml(el.text, el)
+        for hijo in el:
+            yield from self._cadenas(hijo)
+            if hijo.tail:
+                yield TextoLxml(hijo.tail, el)
+
+    # --- Búsqueda ---
+
+    def select(self, css: str):
+        return [NodoLxml(e) for e in _selector(css)(self.el) if e is not self.el]
+
+    def select_one(self, css: str):
+        for e in _selector(css)(self.el):
+            if e is not self.el:
+                return NodoLxml(e)
+        return None
+
+    def find_all(self, name=None, attrs=None, string=None, **kwargs):
+        if string is not None:
+            if hasattr(string, 'search'):
+                return [t for t in self._cadenas(self.el) if string.search(t)]
+            return [t for t in self._cadenas(self.el) if t == string]
+        filtros = dict(attrs or {}, **kwargs)
+        resultado = []
+        for e in self.el.iterdescendants():
+            if _coincide_nombre(e, name) and all(e.get(k) == v for k, v in filtros.items()):
+                resultado.append(NodoLxml(e))
+        return resultado
+
+    def find(self, name=None, attrs=None, **kwargs):
+        encontrados = self.find_all(name, attrs, **kwargs)
+        return encontrados[0] if encontrados else None
+
+    def find_next_sibling(self, name=None):
+        for hermano in self.el.itersiblings():
+            if _coincide_nombre(hermano, name):
+                return NodoLxml(hermano)
+        return None
+
@@ -0,0 +1,120 @@
+"""
+Limitador de tasa adaptativo por dominio.
+
+Combina un token bucket por dominio con un control AIMD (aumento aditivo,
+disminución multiplicativa): la tasa de peticiones sube mientras la tienda
+responde rápido y sin errores, y se reduce a la mitad ante respuestas 429/503,
+timeouts o errores de navegación.
+"""
+
+import asyncio
+import time
+from typing import Dict
+
+from .config import Config
+
+
+class EstadoDominio:
+    """Estado del limitador para un dominio.
+
+    Attributes:
+        tasa (float): Peticiones por segundo permitidas actualmente.
+        tokens (float): Tokens disponibles (negativo = peticiones ya reservadas).
+        exitos (int): Respuestas correctas registradas.
+        errores (int): Errores de navegación registrados.
+        limitados (int): Respuestas 429/503 o timeouts registrados.
+        latencia_media (float): Latencia media móvil (segundos).
+        motivo (str): Razón del último ajuste de tasa.
+    """
+
+    __slots__ = ('tasa', 'tokens', 'ultimo', 'exitos', 'errores', 'limitados', 'latencia_media', 'motivo')
+
+    def __init__(self, tasa: float):
+        self.tasa = tasa
+        self.tokens = 1.0
+        self.ultimo = time.monotonic()
+        self.exitos = 0
+        self.errores = 0
+        self.limitados = 0
+        self.latencia_media = 0.0
+        self.motivo = "inicial"
+
+
+class LimitadorAdaptativo:
+    """Token bucket por dominio con ajuste AIMD de la tasa.
+
+    Note:
+        - `esperar` reserva un token; si no hay disponibles duerme lo justo
+          para respetar la tasa actual del dominio.
+        - `registrar` ajusta la tasa según el resultado de la petición.
+        - `estado` expone por dominio la tasa y el motivo del último ajuste.
+    """
+
+    def __init__(self):
+        self._dominios: Dict[str, EstadoDominio] = {}
+
+    def _estado(self, dominio: str) -> EstadoDominio:
+        estado = self._dominios.get(dominio)
+        if estado is None:
+            estado = self._dominios[dominio] = EstadoDominio(Config.TASA_INICIAL_POR_DOMINIO)
+        return estado
+
+    async def esperar(self, dominio: str):
+        """Reserva un turno de petición para el dominio, esperando si es necesario."""
+        estado = self._estado(dominio)
+        ahora = time.monotonic()
+        capacidad = max(1.0, estado.tasa)
+        estado.tokens = min(capacidad, estado.tokens + (ahora - estado.ultimo) * estado.tasa)
+        estado.ultimo = ahora
+        estado.tokens -= 1
+        if estado.tokens < 0:
+            await asyncio.sleep(-estado.tokens / estado.tasa)
+
+    def registrar(self, dominio: str, latencia: float, ok: bool, limitado: bool = False):
+        """Ajusta la tasa del dominio según el resultado de una petición.
+
+        Args:
+            dominio (str): Dominio de la petición.
+            latencia (float): Duración de la navegación en segundos.
+            ok (bool): True si la página se cargó correctamente.
+            limitado (bool): True si la tienda respondió 429/503 o hubo timeout.
+        """
+        estado = self._estado(dominio)
+        estado.latencia_media = latencia if not estado.latencia_media else 0.8 * estado.latencia_media + 0.2 * latencia
+
+        if limitado or not ok:
+            if limitado:
+                estado.limitados += 1
+                estado.motivo = "limitado (429/503/timeout)"
+            else:
+                estado.errores += 1
+                estado.motivo = "error de navegación"
+            estado.tasa = max(Config.TASA_MINIMA_POR_DOMINIO, estado.tasa * Config.FACTOR_REDUCCION_TASA)
+            estado.tokens = min(estado.tokens, 0.0)
+            return
+
+        estado.exitos += 1
+        if latencia <= Config.LATENCIA_SALUDABLE:
+            estado.tasa = min(Config.TASA_MAXIMA_POR_DOMINIO, estado.tasa + Config.INCREMENTO_TASA)
+            estado.motivo = "saludable"
+        else:
+            estado.motivo = f"latencia alta ({latencia:.1f}s)"
+
+    def estado(self) -> Dict[str, dict]:
+        """Retorna el estado del limitador por dominio.
+
+        Returns:
+            Dict[str, dict]: Por dominio: tasa (req/s), éxitos, errores,
+                limitados, latencia media y motivo del último ajuste.
+        """
+        return {
+            dominio: {
+                'tasa': round(e.tasa, 2),
+                'exitos': e.exitos,
+                'errores': e.errores,
+                'limitados': e.limitados,
+                'latencia_media': round(e.latencia_media, 2),
+                'motivo': e.motivo,
+            }
+            for dominio, e in self._dominios.items()
+        }
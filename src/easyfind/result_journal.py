@@ -0,0 +1,130 @@
+"""
+Bitácora append-only de resultados de scraping.
+
+Cada resultado completado se agrega como una línea JSON (JSONL) apenas llega,
+de modo que el avance queda persistido sin reescribir el Excel completo. Al
+terminar una búsqueda completa la bitácora se borra: solo queda la de una
+búsqueda detenida o interrumpida, que es la que se ofrece reanudar.
+"""
+
+import os
+import json
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+
+def _json_default(valor):
+    """Convierte escalares de numpy/pandas a tipos nativos de Python."""
+    if hasattr(valor, 'item'):
+        return valor.item()
+    return str(valor)
+
+
+class ResultJournal:
+    """Bitácora append-only (JSONL) de resultados de scraping.
+
+    Registrar un resultado cuesta una escritura de línea y un flush al buffer
+    del sistema operativo (microsegundos), en lugar de serializar todo el
+    DataFrame de resultados.
+
+    Attributes:
+        ruta (str): Ruta del archivo .jsonl.
+        registros (int): Resultados escritos desde que se abrió la bitácora.
+    """
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        self.registros = 0
+        self._archivo = None
+
+    @staticmethod
+    def huella(productos: List[str]) -> str:
+        """Calcula la huella (SHA-256) de la lista de productos de un pedido.
+
+        Permite verificar que una bitácora corresponde al mismo PRODUCTOS
+        antes de reanudar desde ella.
+        """
+        return hashlib.sha256("\n".join(productos).encode('utf-8')).hexdigest()
+
+    def abrir(self, reiniciar: bool = True, huella: Optional[str] = None):
+        """Abre la bitácora para escritura.
+
+        Args:
+            reiniciar (bool): Si es True descarta el contenido previo y escribe
+                la cabecera con la huella; si es False agrega al final.
+            huella (str, optional): Huella del pedido (ver `huella`).
+        """
+        linea_cortada = False
+        if not reiniciar:
+            # Una caída a mitad de escritura deja la última línea sin salto
+            try:
+                with open(self.ruta, 'rb') as f:
+                    f.seek(0, 2)
+                    if f.tell() > 0:
+                        f.seek(-1, 2)
+                        linea_cortada = f.read(1) != b"\n"
+            except OSError:
+                pass
+        self._archivo = open(self.ruta, 'w' if reiniciar else 'a', encoding='utf-8')
+        self.registros = 0
+        if linea_cortada:
+            self._archivo.write("\n")
+        if reiniciar:
+            self._archivo.write(json.dumps({'cabecera': True, 'huella': huella}) + "\n")
+            self._archivo.flush()
+
+    def cargar(self, huella: str) -> Optional[Dict[Tuple[int, str], dict]]:
+        """Lee los resultados completados de una bitácora existente.
+
+        Args:
+            huella (str): Huella del pedido actual; debe coincidir con la de
+                la cabecera de la bitácora.
+
+        Returns:
+            Optional[Dict[Tuple[int, str], dict]]: Registros por (fila, tienda),
+                o None si no hay bitácora o pertenece a otro pedido. Las líneas
+                incompletas (p. ej. por una caída a mitad de escritura) se ignoran.
+        """
+        completados = {}
+        try:
+            with open(self.ruta, encoding='utf-8') as f:
+                cabecera = json.loads(f.readline() or '{}')
+                if not cabecera.get('cabecera') or cabecera.get('huella') != huella:
+                    return None
+                for linea in f:
+                    try:
+                        registro = json.loads(linea)
+                        completados[(registro['fila'], registro['tienda'])] = registro
+                    except (ValueError, KeyError):
+                        continue
+        except (OSError, ValueError):
+            return None
+        return completados
+
+    def registrar(self, row_idx, tienda: str, link: str, marca: str, precio):
+        """Agrega el resultado de una celda (fila, tienda) a la bitácora."""
+        if self._archivo is None:
+            return
+        registro = {'fila': row_idx, 'tienda': tienda, 'link': link, 'marca': marca, 'precio': precio}
+        self._archivo.write(json.dumps(registro, ensure_ascii=False, default=_json_default) + "\n")
+        self._archivo.flush()
+        self.registros += 1
+
+    def cerrar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+    def eliminar(self):
+        """Cierra y borra la bitácora (la búsqueda terminó y no hay nada que reanudar)."""
+        self.cerrar()
+        try:
+            os.remove(self.ruta)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "ResultJournal":
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
@@ -0,0 +1,99 @@
+"""
+Caché persistente (SQLite) de resultados de scraping.
+
+Guarda por URL el precio, la marca, el error y la fecha de obtención, de modo
+que cotizaciones repetidas sobre listas de productos similares no vuelvan a
+navegar páginas consultadas recientemente.
+"""
+
+import sqlite3
+import time
+from typing import Optional, Tuple
+
+from .config import Config
+from .utils import Utils
+
+
+class CacheScraping:
+    """Caché de resultados de scraping con TTL por tienda.
+
+    Attributes:
+        ruta (str): Ruta del archivo SQLite.
+        forzar_actualizacion (bool): Si es True no se leen resultados de la
+            caché (se vuelve a scrapear todo), pero sí se guardan los nuevos.
+        aciertos (int): Consultas resueltas desde la caché.
+        fallos (int): Consultas que requirieron scraping.
+
+    Note:
+        - La clave es la URL normalizada (`Utils.normalizar_url`).
+        - El TTL se toma de `Config.TTL_CACHE_POR_TIENDA` o, si la tienda no
+          aparece, de `Config.TTL_CACHE_HORAS`.
+        - Los resultados con error expiran tras `Config.TTL_CACHE_ERROR_HORAS`.
+        - Los errores locales (`ERRORES_LOCALES`: navegador o proceso de
+          scraping caído) no se guardan: no dicen nada de la tienda.
+    """
+
+    ERRORES_LOCALES = ('Driver:', 'Local:')
+
+    def __init__(self, ruta: str, forzar_actualizacion: bool = False):
+        self.ruta = ruta
+        self.forzar_actualizacion = forzar_actualizacion
+        self.aciertos = 0
+        self.fallos = 0
+        self._conexion = sqlite3.connect(ruta)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.execute(
+            "CREATE TABLE IF NOT EXISTS resultados ("
+            " url TEXT PRIMARY KEY, tienda TEXT, precio INTEGER, marca TEXT,"
+            " error TEXT, obtenido REAL)"
+        )
+        self._conexion.commit()
+
+    @staticmethod
+    def ttl_horas(tienda: str, error: str = "") -> float:
+        """Retorna el TTL (horas) aplicable a un resultado de la tienda."""
+        if error:
+            return Config.TTL_CACHE_ERROR_HORAS
+        return Config.TTL_CACHE_POR_TIENDA.get(tienda, Config.TTL_CACHE_HORAS)
+
+    def obtener(self, url: str, tienda: str) -> Optional[Tuple[int, str, str]]:
+        """Busca un resultado vigente para la URL.
+
+        Args:
+            url (str): URL del producto.
+            tienda (str): Tienda de la URL (define el TTL).
+
+        Returns:
+            Optional[Tuple[int, str, str]]: (precio, marca, error) si hay un
+                resultado vigente, o None si hay que scrapear.
+        """
+        fila = None
+        if not self.forzar_actualizacion:
+            fila = self._conexion.execute(
+                "SELECT precio, marca, error, obtenido FROM resultados WHERE url = ?",
+                (Utils.normalizar_url(url),)
+            ).fetchone()
+        if fila is not None:
+            precio, marca, error, obtenido = fila
+            if time.time() - obtenido <= self.ttl_horas(tienda, error) * 3600:
+                self.aciertos += 1
+                return precio, marca, error
+        self.fallos += 1
+        return None
+
+    def guardar(self, url: str, tienda: str, precio: int, marca: str, error: str):
+        """Guarda (o reemplaza) el resultado de scraping de una URL (salvo errores locales)."""
+        if error and error.startswith(self.ERRORES_LOCALES):
+            return
+        self._conexion.execute(
+            "INSERT OR REPLACE INTO resultados (url, tienda, precio, marca, error, obtenido)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            (Utils.normalizar_url(url), tienda, int(precio), marca, error, time.time())
+        )
+        self._conexion.commit()
+
+    def cerrar(self):
+        if self._conexion is not None:
+            self._conexion.close()
+            self._conexion = None
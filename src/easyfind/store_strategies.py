@@ -12,6 +12,75 @@ from .utils import Utils
 from .config import TASA_DOLAR
 
 
+# --- Extracción dentro del navegador (page.evaluate) ---
+# Cada script retorna {precios: [{numero} | {texto}], marcas: [str]} con los
+# candidatos en el mismo orden de prioridad que las estrategias Python; la
+# validación final (limpiar_precio_clp / validar_marca) se hace en Python.
+
+_JS_MARCA_JSON_LD = r"""
+  buscarJsonLd: for (const s of document.querySelectorAll('script[type="application/ld+json"]')) {
+    try {
+      const data = JSON.parse(s.textContent);
+      for (const item of (Array.isArray(data) ? data : [data])) {
+        if (item && item['@type'] === 'Product' && item.brand) {
+          marcas.push(typeof item.brand === 'object' ? item.brand.name : String(item.brand));
+          break buscarJsonLd;
+        }
+      }
+    } catch (e) {}
+  }
+"""
+
+_JS_MARCA_GENERICA = r"""
+  for (const sel of ['meta[itemprop="brand"]', 'meta[property="product:brand"]',
+                     'meta[name="brand"]', 'meta[itemprop="manufacturer"]']) {
+    const el = document.querySelector(sel);
+    if (el && el.getAttribute('content')) marcas.push(el.getAttribute('content'));
+  }
+  const etiquetas = ['TD', 'DD', 'SPAN', 'DIV', 'P', 'STRONG'];
+  const walker = document.createTreeWalker(document.documentElement, NodeFilter.SHOW_TEXT);
+  while (walker.nextNode() && marcas.length < 20) {
+    const nodo = walker.currentNode;
+    if (nodo.data.length > 30 || !/Marca|Fabricante|Brand/i.test(nodo.data)) continue;
+    const padre = nodo.parentElement;
+    if (!padre || ['SCRIPT', 'STYLE', 'HEAD', 'TITLE', 'A'].includes(padre.tagName)) continue;
+    let siguiente = padre.nextElementSibling;
+    while (siguiente && !etiquetas.includes(siguiente.tagName)) siguiente = siguiente.nextElementSibling;
+    if (siguiente) marcas.push(siguiente.textContent.replace(/\s+/g, ' ').trim());
+  }
+"""
+
+_JS_PRECIO_DARTEL = r"""
+  const template = document.querySelector('template[data-varname="__STATE__"]');
+  if (template) {
+    try {
+      const script = (template.content || template).querySelector('script');
+      const data = JSON.parse(script.textContent);
+      for (const [clave, valor] of Object.entries(data)) {
+        if (valor && typeof valor === 'object' && clave.includes('commertialOffer')
+            && typeof valor.Price === 'number' && valor.Price > 0) {
+          precios.push({numero: valor.Price});
+          break;
+        }
+      }
+    } catch (e) {}
+  }
+  for (const el of document.querySelectorAll('[class*="sellingPriceValue"]')) precios.push({texto: el.textContent});
+  const meta = document.querySelector('meta[property="product:price:amount"]');
+  if (meta && meta.getAttribute('content')) precios.push({numero: parseFloat(meta.getAttribute('content'))});
+"""
+
+
+def _script_navegador(*bloques: str) -> str:
+    return "() => {\n  const precios = [];\n  const marcas = [];\n" + "".join(bloques) + "  return {precios, marcas};\n}"
+
+
+# Página de Sonepar lista: JSON-LD de producto con marca (el de Organization o
+# WebSite viene desde el HTML inicial y no sirve) o la meta de marca
+_JS_LISTO_SONEPAR = ("() => {\n  const marcas = [];\n" + _JS_MARCA_JSON_LD
+                     + "  return marcas.length > 0 || !!document.querySelector('meta[itemprop=\"brand\"][content]');\n}")
+
+
 class StoreStrategies:
     """Estrategias de extracción específicas por tienda para marcas y precios.
     
@@ -104,17 +173,14 @@ class StoreStrategies:
         return None
 
     @staticmethod
-    def extract_dartel_price(soup):
-        """Extrae el precio del producto desde Dartel (plataforma VTEX).
-        
-        Intenta extraer el precio desde el JSON del template __STATE__ de VTEX,
-        luego desde selectores CSS de precio, y finalmente desde meta tags.
+    def extract_dartel_state_price(soup):
+        """Extrae el precio de Dartel solo desde el JSON del template __STATE__ de VTEX.
         
         Args:
             soup: Objeto BeautifulSoup con el HTML parseado.
         
         Returns:
-            int: Precio en CLP como entero, 0 si no se encuentra.
+            int: Precio en CLP como entero, 0 si no hay __STATE__ con precio.
         """
         try:
             template = soup.find('template', attrs={'data-varname': '__STATE__'})
@@ -128,6 +194,23 @@ class StoreStrategies:
                             if price and isinstance(price, (int, float)) and price > 0:
                                 return int(price)
         except Exception: pass
+        return 0
+
+    @staticmethod
+    def extract_dartel_price(soup):
+        """Extrae el precio del producto desde Dartel (plataforma VTEX).
+        
+        Intenta extraer el precio desde el JSON del template __STATE__ de VTEX,
+        luego desde selectores CSS de precio, y finalmente desde meta tags.
+        
+        Args:
+            soup: Objeto BeautifulSoup con el HTML parseado.
+        
+        Returns:
+            int: Precio en CLP como entero, 0 si no se encuentra.
+        """
+        precio = StoreStrategies.extract_dartel_state_price(soup)
+        if precio > 0: return precio
         
         precios_vtex = soup.select('[class*="sellingPriceValue"]')
         for el in precios_vtex:
@@ -222,6 +305,9 @@ class StoreStrategies:
             pass
         return 0
 
+    JS_DARTEL = _script_navegador(_JS_PRECIO_DARTEL, _JS_MARCA_GENERICA)
+    JS_SONEPAR = _script_navegador(_JS_MARCA_JSON_LD, _JS_MARCA_GENERICA)
+
     @staticmethod
     def get_brand_strategy(domain: str):
         """Retorna la función de extracción de marca apropiada para el dominio dado.
@@ -263,3 +349,49 @@ class StoreStrategies:
         for clave, estrategia in ESTRATEGIAS_PRECIO.items():
             if clave in domain: return estrategia
         return None
+
+    @staticmethod
+    def get_browser_strategy(domain: str):
+        """Retorna el script de extracción en el navegador para el dominio dado.
+        
+        El script se ejecuta con `page.evaluate` y retorna solo los candidatos
+        de precio y marca, evitando serializar la página completa con
+        `page.content()` y volver a parsearla en Python.
+        
+        Args:
+            domain (str): Dominio o URL de la tienda.
+        
+        Returns:
+            str o None: Función JavaScript si hay estrategia para el dominio.
+        """
+        ESTRATEGIAS_NAVEGADOR = {
+            'dartel': StoreStrategies.JS_DARTEL,
+            'sonepar': StoreStrategies.JS_SONEPAR
+        }
+        for clave, script in ESTRATEGIAS_NAVEGADOR.items():
+            if clave in domain: return script
+        return None
+
+    @staticmethod
+    def get_ready_condition(domain: str):
+        """Retorna la condición que indica que el precio ya está renderizado.
+        
+        Reemplaza las esperas fijas por tienda: el scraper espera la condición
+        (con tope `Config.ESPERA_LISTO_MAXIMA_MS`) y luego extrae.
+        
+        Args:
+            domain (str): Dominio o URL de la tienda.
+        
+        Returns:
+            dict o None: {'selector': css} (elemento presente en el DOM) o
+                {'funcion': js} (expresión que debe ser verdadera), o None si
+                la página está lista al cargar el DOM.
+        """
+        CONDICIONES_LISTO = {
+            'dartel': {'funcion': "() => !!document.querySelector('[class*=\"sellingPriceValue\"]') || "
+                                  "!!document.querySelector('template[data-varname=\"__STATE__\"]')"},
+            'sonepar': {'funcion': _JS_LISTO_SONEPAR}
+        }
+        for clave, condicion in CONDICIONES_LISTO.items():
+            if clave in domain: return condicion
+        return None
@@ -7,6 +7,7 @@ formatos y monedas, y validar nombres de marcas.
 
 import re
 from typing import Optional, Dict, Any
+from urllib.parse import urlsplit, urlunsplit
 
 from .config import Config
 
@@ -45,6 +46,43 @@ class Utils:
         t = t.replace(',', ' ').replace('-', ' ').replace('/', ' ')
         return t
 
+    @staticmethod
+    def extraer_dominio(url: str) -> str:
+        """Extrae el dominio (host) de una URL.
+        
+        Args:
+            url (str): URL completa del producto.
+        
+        Returns:
+            str: Dominio de la URL, o 'generic' si la URL no tiene esquema.
+        
+        Example:
+            >>> Utils.extraer_dominio("https://www.vitel.cl/cable-utp")
+            'www.vitel.cl'
+        """
+        return url.split('/')[2] if '//' in url else 'generic'
+
+    @staticmethod
+    def normalizar_url(url: str) -> str:
+        """Normaliza una URL para detectar páginas duplicadas.
+        
+        Pasa esquema y dominio a minúsculas, elimina el fragmento (#...) y la
+        barra final de la ruta. Conserva la query string.
+        
+        Args:
+            url (str): URL del producto.
+        
+        Returns:
+            str: URL normalizada.
+        
+        Example:
+            >>> Utils.normalizar_url("HTTPS://www.Vitel.cl/cable-utp/#specs")
+            'https://www.vitel.cl/cable-utp'
+        """
+        partes = urlsplit(str(url).strip())
+        ruta = partes.path.rstrip('/') or '/'
+        return urlunsplit((partes.scheme.lower(), partes.netloc.lower(), ruta, partes.query, ''))
+
     @staticmethod
     def limpiar_precio_clp(valor) -> int:
         """Parsea y limpia un precio en pesos chilenos desde diferentes formatos.
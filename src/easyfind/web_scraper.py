@@ -5,15 +5,264 @@ Maneja la automatización del navegador Chromium para scraping de páginas diná
 """
 
 import asyncio
+import os
 import random
-from typing import Tuple
+import re
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 
 import pandas as pd
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
+import requests
+from requests.adapters import HTTPAdapter
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 
-from .config import Config
+from .config import Config, AIOHTTP_DISPONIBLE
+from .utils import Utils
 from .content_parser import ContentParser
+from .store_strategies import StoreStrategies
+from .rate_limiter import LimitadorAdaptativo
+
+
+class RespuestaLimitada(Exception):
+    """La tienda respondió 429/503 (ya registrado en el limitador)."""
+
+
+class ClienteHTTP:
+    """Cliente HTTP con conexiones keep-alive reutilizables para tiendas estáticas.
+    
+    Usa aiohttp si está instalado; en otro caso usa una sesión de requests
+    con pool de conexiones, ejecutada en hilos para no bloquear el event loop.
+    """
+    
+    def __init__(self):
+        self._sesion = None
+    
+    def _headers(self):
+        return {
+            'User-Agent': random.choice(Config.USER_AGENTS),
+            'Accept': 'text/html,application/xhtml+xml',
+            'Accept-Language': 'es-CL,es;q=0.9',
+        }
+    
+    async def obtener(self, url: str) -> Tuple[int, str]:
+        """Descarga una página.
+        
+        Args:
+            url (str): URL a descargar.
+        
+        Returns:
+            Tuple[int, str]: (código de estado HTTP, HTML)
+        """
+        if AIOHTTP_DISPONIBLE:
+            import aiohttp
+            if self._sesion is None:
+                self._sesion = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=Config.CONCURRENCIA_GLOBAL,
+                                                   limit_per_host=Config.CONCURRENCIA_POR_TIENDA),
+                    timeout=aiohttp.ClientTimeout(total=Config.TIMEOUT_HTTP_DIRECTO)
+                )
+            async with self._sesion.get(url, headers=self._headers()) as respuesta:
+                return respuesta.status, await respuesta.text(errors='replace')
+        
+        if self._sesion is None:
+            self._sesion = requests.Session()
+            adaptador = HTTPAdapter(pool_connections=Config.CONCURRENCIA_GLOBAL,
+                                    pool_maxsize=Config.CONCURRENCIA_POR_TIENDA)
+            self._sesion.mount('http://', adaptador)
+            self._sesion.mount('https://', adaptador)
+        respuesta = await asyncio.to_thread(
+            self._sesion.get, url, headers=self._headers(), timeout=Config.TIMEOUT_HTTP_DIRECTO
+        )
+        return respuesta.status_code, respuesta.text
+    
+    async def cerrar(self):
+        if self._sesion is not None:
+            if AIOHTTP_DISPONIBLE: await self._sesion.close()
+            else: self._sesion.close()
+            self._sesion = None
+
+
+class PoliticaBloqueo:
+    """Política de bloqueo de peticiones para los contextos de una tienda.
+    
+    Bloquea los tipos de recurso de `Config.RECURSOS_BLOQUEADOS` según la
+    extensión de la URL (`Config.EXTENSIONES_POR_RECURSO`) y los hosts de
+    terceros de la lista global o de la tienda. Ambas reglas se expresan como
+    expresiones regulares que Playwright evalúa en el driver, de modo que
+    solo las peticiones a bloquear pasan por Python; el documento, los
+    scripts y las llamadas XHR de la tienda no se interceptan.
+    
+    Attributes:
+        base (str): Dominio de la tienda sin 'www.' (primer nivel propio).
+        bloqueados (List[str]): Hosts de terceros bloqueados.
+        permitidos (List[str]): Hosts de terceros que nunca se bloquean.
+        recursos (Dict[str, str]): Extensión -> tipo de recurso bloqueado.
+        patron_recursos (Optional[re.Pattern]): URLs con extensión bloqueada.
+        patron_hosts (Optional[re.Pattern]): URLs de hosts bloqueados.
+    """
+    
+    __slots__ = ('base', 'bloqueados', 'permitidos', 'recursos', 'patron_recursos', 'patron_hosts')
+    
+    def __init__(self, dominio: str):
+        self.base = dominio[4:] if dominio.startswith('www.') else dominio
+        self.bloqueados = list(Config.HOSTS_TERCEROS_BLOQUEADOS)
+        self.permitidos = []
+        for fragmento, hosts in Config.HOSTS_BLOQUEADOS_POR_TIENDA.items():
+            if fragmento in dominio: self.bloqueados.extend(hosts)
+        for fragmento, hosts in Config.HOSTS_PERMITIDOS_POR_TIENDA.items():
+            if fragmento in dominio: self.permitidos.extend(hosts)
+        self.recursos = {
+            extension: tipo
+            for tipo, extensiones in Config.EXTENSIONES_POR_RECURSO.items() if tipo in Config.RECURSOS_BLOQUEADOS
+            for extension in extensiones
+        }
+        # Sintaxis compatible con RegExp de JavaScript (el driver compila el patrón)
+        self.patron_recursos = re.compile(
+            r"^[^?#]*\.(?:" + "|".join(sorted(self.recursos)) + r")(?:[?#]|$)", re.IGNORECASE
+        ) if self.recursos else None
+        self.patron_hosts = re.compile(
+            r"^[a-z]+://(?:[^/?#@]*\.)?(?:" + "|".join(h.replace('.', r'\.') for h in self.bloqueados)
+            + r")(?::\d+)?(?:[/?#]|$)", re.IGNORECASE
+        ) if self.bloqueados else None
+    
+    @staticmethod
+    def _coincide(host: str, hosts: List[str]) -> bool:
+        return any(host == h or host.endswith('.' + h) for h in hosts)
+    
+    def tipo_recurso(self, url: str) -> str:
+        """Tipo de recurso bloqueado al que corresponde la extensión de la URL."""
+        extension = os.path.splitext(urlsplit(url).path)[1][1:].lower()
+        return self.recursos.get(extension, 'otro')
+    
+    def bloquea_host(self, url: str) -> bool:
+        """Confirma el bloqueo por host (la tienda y sus hosts permitidos nunca se bloquean)."""
+        host = urlsplit(url).hostname or ''
+        if host == self.base or host.endswith('.' + self.base) or self._coincide(host, self.permitidos):
+            return False
+        return self._coincide(host, self.bloqueados)
+
+
+class ContextoPool:
+    """Contexto de navegador con su pestaña, prestado desde `PoolContextos`.
+    
+    Attributes:
+        dominio (str): Dominio al que pertenece el contexto.
+        context: BrowserContext de Playwright.
+        page: Page de Playwright reutilizada entre navegaciones.
+        navegaciones (int): Páginas visitadas con este contexto.
+    """
+    
+    __slots__ = ('dominio', 'context', 'page', 'navegaciones')
+    
+    def __init__(self, dominio, context, page):
+        self.dominio = dominio
+        self.context = context
+        self.page = page
+        self.navegaciones = 0
+
+
+class PoolContextos:
+    """Pool de contextos de navegador de larga vida agrupados por dominio.
+    
+    Cada URL toma prestado un contexto (con su pestaña) del dominio y lo
+    devuelve al terminar, conservando cookies, conexiones y caché HTTP entre
+    páginas de la misma tienda. Los contextos se reciclan tras
+    `Config.NAVEGACIONES_POR_CONTEXTO` navegaciones o si la pestaña falló.
+    
+    Cada contexto aplica la `PoliticaBloqueo` de su tienda mediante dos rutas
+    (hosts y extensiones) registradas al crearlo.
+    
+    Attributes:
+        browser: Navegador Chromium desde el cual se crean los contextos.
+        max_por_dominio (int): Contextos libres retenidos por dominio.
+        max_navegaciones (int): Navegaciones antes de reciclar un contexto.
+        bloqueos (dict): Peticiones bloqueadas por motivo (tipo de recurso o 'terceros').
+        bytes_ahorrados (int): Estimación de bytes no descargados.
+    """
+    
+    def __init__(self, browser, max_por_dominio: int, max_navegaciones: int):
+        self.browser = browser
+        self.max_por_dominio = max_por_dominio
+        self.max_navegaciones = max_navegaciones
+        self._libres: Dict[str, List[ContextoPool]] = defaultdict(list)
+        self._politicas: Dict[str, PoliticaBloqueo] = {}
+        self.bloqueos = defaultdict(int)
+        self.bytes_ahorrados = 0
+    
+    async def _crear(self, dominio: str) -> ContextoPool:
+        context = await self.browser.new_context(
+            user_agent=random.choice(Config.USER_AGENTS),
+            viewport={'width': 1280, 'height': 800}
+        )
+        politica = self._politicas.get(dominio)
+        if politica is None:
+            politica = self._politicas[dominio] = PoliticaBloqueo(dominio)
+        
+        async def bloquear_host(route):
+            peticion = route.request
+            if not politica.bloquea_host(peticion.url):
+                await route.fallback()
+                return
+            self.bloqueos['terceros'] += 1
+            self.bytes_ahorrados += Config.BYTES_ESTIMADOS_POR_RECURSO.get(peticion.resource_type, 0)
+            await route.abort()
+        
+        async def bloquear_recurso(route):
+            tipo = politica.tipo_recurso(route.request.url)
+            self.bloqueos[tipo] += 1
+            self.bytes_ahorrados += Config.BYTES_ESTIMADOS_POR_RECURSO.get(tipo, 0)
+            await route.abort()
+        
+        # Solo las URLs que calzan con los patrones llegan a Python
+        if politica.patron_hosts is not None:
+            await context.route(politica.patron_hosts, bloquear_host)
+        if politica.patron_recursos is not None:
+            await context.route(politica.patron_recursos, bloquear_recurso)
+        page = await context.new_page()
+        return ContextoPool(dominio, context, page)
+    
+    async def tomar(self, dominio: str) -> ContextoPool:
+        """Entrega un contexto libre del dominio o crea uno nuevo."""
+        libres = self._libres[dominio]
+        while libres:
+            entrada = libres.pop()
+            if not entrada.page.is_closed():
+                return entrada
+            await self._cerrar(entrada)
+        return await self._crear(dominio)
+    
+    async def devolver(self, entrada: ContextoPool, descartar: bool = False):
+        """Devuelve un contexto al pool, o lo cierra si debe reciclarse.
+        
+        Args:
+            entrada (ContextoPool): Contexto obtenido con `tomar`.
+            descartar (bool): Cerrar el contexto (p. ej. tras un error de navegación).
+        """
+        entrada.navegaciones += 1
+        libres = self._libres[entrada.dominio]
+        if (descartar or entrada.navegaciones >= self.max_navegaciones
+                or len(libres) >= self.max_por_dominio or entrada.page.is_closed()):
+            await self._cerrar(entrada)
+        else:
+            libres.append(entrada)
+    
+    @staticmethod
+    async def _cerrar(entrada: ContextoPool):
+        try:
+            await entrada.context.close()
+        except Exception:
+            pass
+    
+    async def cerrar(self):
+        """Cierra todos los contextos libres del pool."""
+        for libres in self._libres.values():
+            for entrada in libres:
+                await self._cerrar(entrada)
+        self._libres.clear()
 
 
 class WebScraper:
@@ -25,10 +274,24 @@ class WebScraper:
     Attributes:
         playwright: Instancia de Playwright para control del navegador.
         browser: Instancia del navegador Chromium.
+        pool (PoolContextos): Contextos reutilizables por dominio.
+        limitador (LimitadorAdaptativo): Control de tasa adaptativo por dominio.
+        http (ClienteHTTP): Cliente para tiendas que no requieren JavaScript.
+        pool_parseo (ProcessPoolExecutor): Procesos que parsean el HTML fuera del event loop.
+        contadores (dict): Páginas resueltas por HTTP directo, derivadas al navegador
+            y resueltas con extracción dentro de la página.
+        tiempos_listo (dict): Por dominio, [esperas, ms totales, ms máximo, esperas
+            que agotaron el tope] hasta cumplir la condición de página lista.
+        parseo_parcial (dict): Por dominio, [páginas resueltas con datos estructurados,
+            páginas candidatas] del parseo parcial.
     
     Note:
         - Usa Chromium en modo headless para mejor rendimiento
-        - Bloquea imágenes/CSS/fuentes para acelerar carga 3x
+        - Reutiliza contextos y pestañas por dominio (PoolContextos)
+        - Ajusta la tasa por dominio según latencia y errores (AIMD)
+        - Descarga por HTTP directo las tiendas estáticas (Config.TIENDAS_HTTP_DIRECTO)
+        - Parsea el HTML en procesos aparte (Config.PROCESOS_PARSEO)
+        - Bloquea imágenes/CSS/fuentes/multimedia y hosts de analítica o widgets (PoliticaBloqueo)
         - Implementa rotación de User-Agents
         - Maneja timeouts y errores automáticamente
         - Compatible con aplicaciones empaquetadas (PyInstaller)
@@ -37,6 +300,13 @@ class WebScraper:
     def __init__(self):
         self.playwright = None
         self.browser = None
+        self.pool = None
+        self.limitador = LimitadorAdaptativo()
+        self.http = ClienteHTTP()
+        self.pool_parseo = None
+        self.contadores = {'http_directo': 0, 'http_a_navegador': 0, 'extraccion_en_pagina': 0}
+        self.parseo_parcial = defaultdict(lambda: [0, 0])
+        self.tiempos_listo = defaultdict(lambda: [0, 0.0, 0.0, 0])
     
     async def start(self):
         if not self.playwright:
@@ -45,12 +315,123 @@ class WebScraper:
                 headless=True,
                 args=['--disable-gpu', '--no-sandbox']
             )
+            self.pool = PoolContextos(self.browser, Config.CONCURRENCIA_POR_TIENDA, Config.NAVEGACIONES_POR_CONTEXTO)
+        procesos = Config.PROCESOS_PARSEO if Config.PROCESOS_PARSEO is not None else (os.cpu_count() or 1)
+        if self.pool_parseo is None and procesos > 0:
+            self.pool_parseo = ProcessPoolExecutor(max_workers=procesos)
 
     async def stop(self):
+        await self.http.cerrar()
+        if self.pool_parseo:
+            self.pool_parseo.shutdown(wait=False, cancel_futures=True)
+            self.pool_parseo = None
+        if self.pool: await self.pool.cerrar()
         if self.browser: await self.browser.close()
         if self.playwright: await self.playwright.stop()
         print("Motor detenido.")
 
+    async def extraer(self, html: str, url: str) -> Tuple[int, str]:
+        """Parsea el HTML y extrae (precio, marca) en el pool de procesos.
+        
+        Si no hay pool (PROCESOS_PARSEO = 0) o este dejó de funcionar, parsea
+        en el proceso actual. Registra en `parseo_parcial` si la página se
+        resolvió solo con datos estructurados.
+        """
+        resultado = None
+        if self.pool_parseo is not None:
+            try:
+                resultado = await asyncio.get_running_loop().run_in_executor(
+                    self.pool_parseo, ContentParser.extraer_de_html_parcial, html, url
+                )
+            except BrokenProcessPool:
+                self.pool_parseo = None
+        if resultado is None:
+            resultado = ContentParser.extraer_de_html_parcial(html, url)
+        precio, marca, parcial = resultado
+        if Config.PARSEO_PARCIAL and ContentParser.admite_parseo_parcial(url):
+            estadistica = self.parseo_parcial[Utils.extraer_dominio(url)]
+            estadistica[0] += parcial
+            estadistica[1] += 1
+        return precio, marca
+
+    async def esperar_listo(self, page, condicion: dict, dominio: str):
+        """Espera la condición de página lista de la tienda, con tope.
+        
+        Si la condición no se cumple dentro de `Config.ESPERA_LISTO_MAXIMA_MS`
+        se continúa igualmente con la extracción. Registra el tiempo de espera
+        en `tiempos_listo`.
+        """
+        inicio = time.monotonic()
+        agotado = False
+        try:
+            if 'selector' in condicion:
+                await page.wait_for_selector(condicion['selector'], state='attached',
+                                             timeout=Config.ESPERA_LISTO_MAXIMA_MS)
+            else:
+                await page.wait_for_function(condicion['funcion'], timeout=Config.ESPERA_LISTO_MAXIMA_MS)
+        except PlaywrightTimeoutError:
+            agotado = True
+        ms = (time.monotonic() - inicio) * 1000
+        estadistica = self.tiempos_listo[dominio]
+        estadistica[0] += 1
+        estadistica[1] += ms
+        estadistica[2] = max(estadistica[2], ms)
+        estadistica[3] += agotado
+
+    def estadisticas(self) -> dict:
+        """Retorna los contadores del scraper en tipos simples (serializables entre procesos).
+        
+        Returns:
+            dict: contadores, bloqueos, bytes_ahorrados, tiempos_listo,
+                parseo_parcial y limitador (estado por dominio).
+        """
+        return {
+            'contadores': dict(self.contadores),
+            'bloqueos': dict(self.pool.bloqueos) if self.pool else {},
+            'bytes_ahorrados': self.pool.bytes_ahorrados if self.pool else 0,
+            'tiempos_listo': {d: list(v) for d, v in self.tiempos_listo.items()},
+            'parseo_parcial': {d: list(v) for d, v in self.parseo_parcial.items()},
+            'limitador': self.limitador.estado(),
+        }
+
+    @staticmethod
+    def usa_http_directo(url: str) -> bool:
+        """Indica si la URL pertenece a una tienda que se puede leer sin navegador."""
+        url_lower = url.lower()
+        if any(t in url_lower for t in Config.TIENDAS_DINAMICAS): return False
+        return any(t in url_lower for t in Config.TIENDAS_HTTP_DIRECTO)
+
+    async def _procesar_http(self, url: str, dominio: str) -> Optional[Tuple[int, str, str]]:
+        """Intenta extraer precio y marca con una petición HTTP simple.
+        
+        Returns:
+            Optional[Tuple[int, str, str]]: Resultado si se obtuvo precio, o None
+                para continuar con el navegador.
+        """
+        await self.limitador.esperar(dominio)
+        inicio = time.monotonic()
+        try:
+            estado, html = await self.http.obtener(url)
+        except Exception as e:
+            self.limitador.registrar(dominio, time.monotonic() - inicio, ok=False,
+                                     limitado=isinstance(e, (asyncio.TimeoutError, requests.Timeout)))
+            return None
+        if estado in (429, 503):
+            self.limitador.registrar(dominio, time.monotonic() - inicio, ok=False, limitado=True)
+            return None
+        self.limitador.registrar(dominio, time.monotonic() - inicio, ok=estado == 200)
+        if estado != 200:
+            return None
+        
+        try:
+            precio, marca = await self.extraer(html, url)
+        except Exception:
+            # Un fallo de la estrategia con el HTML del servidor se reintenta con el navegador
+            return None
+        if precio > 0:
+            return precio, marca, ""
+        return None
+
     async def procesar_url(self, url: str) -> Tuple[int, str, str]:
         """Hace scraping de URL para extraer precio y marca.
         
@@ -67,43 +448,70 @@ class WebScraper:
         if 'automatec.cl' in url and "id_currency=" not in url: 
             url += "&id_currency=1" if "?" in url else "?id_currency=1"
 
-        page = None
         INTENTOS_MAXIMOS = 2
+        dominio = Utils.extraer_dominio(url)
+        
+        # Camino rápido: HTML del servidor sin navegador
+        if self.usa_http_directo(url):
+            resultado = await self._procesar_http(url, dominio)
+            if resultado:
+                self.contadores['http_directo'] += 1
+                return resultado
+            self.contadores['http_a_navegador'] += 1
         
         try:
             if not self.browser: await self.start()
-            context = await self.browser.new_context(
-                user_agent=random.choice(Config.USER_AGENTS),
-                viewport={'width': 1280, 'height': 800}
-            )
-            page = await context.new_page()
-            await page.route("**/*.{png,jpg,jpeg,svg,css,woff,woff2,gif,ico}", lambda route: route.abort())
-
+            entrada = await self.pool.tomar(dominio)
+        except Exception as e:
+            return 0, "Sin Marca", f"Driver: {str(e)}"
+        
+        page = entrada.page
+        descartar = False
+        try:
             for intento in range(1, INTENTOS_MAXIMOS + 1):
+                # El limitador reemplaza las pausas aleatorias fijas
+                await self.limitador.esperar(dominio)
+                inicio = time.monotonic()
+                registrado = False  # El limitador cuenta cada navegación una sola vez
                 try:
-                    await asyncio.sleep(random.uniform(0.1, 0.5))
-                    await page.goto(url, timeout=25000, wait_until='domcontentloaded')
+                    respuesta = await page.goto(url, timeout=25000, wait_until='domcontentloaded')
+                    if respuesta is not None and respuesta.status in (429, 503):
+                        registrado = True
+                        self.limitador.registrar(dominio, time.monotonic() - inicio, ok=False, limitado=True)
+                        raise RespuestaLimitada(f"HTTP {respuesta.status}")
                     
-                    if 'sonepar' in url.lower(): await page.wait_for_timeout(1000) 
-                    if 'dartel' in url.lower(): await page.wait_for_timeout(800)
+                    registrado = True
+                    self.limitador.registrar(dominio, time.monotonic() - inicio, ok=True)
+                    
+                    condicion = StoreStrategies.get_ready_condition(url.lower())
+                    if condicion: await self.esperar_listo(page, condicion, dominio)
 
-                    html = await page.content()
-                    soup = BeautifulSoup(html, 'html.parser')
+                    # Extracción dentro de la página: solo viajan los candidatos de precio/marca
+                    script = StoreStrategies.get_browser_strategy(url.lower())
+                    if script:
+                        try:
+                            datos = await page.evaluate(script)
+                        except Exception:
+                            datos = None
+                        resultado = ContentParser.interpretar_extraccion_navegador(datos, url) if datos else None
+                        if resultado:
+                            self.contadores['extraccion_en_pagina'] += 1
+                            return resultado[0], resultado[1], ""
 
-                    precio = ContentParser.extraer_precio(soup, url)
-                    marca = ContentParser.extraer_marca(soup, url)
+                    html = await page.content()
+                    precio, marca = await self.extraer(html, url)
 
-                    await page.close()
-                    await context.close()
                     return precio, marca, ""
                 except Exception as e:
+                    # Un fallo del parseo tras una navegación exitosa no es un fallo de la tienda
+                    if not registrado:
+                        self.limitador.registrar(dominio, time.monotonic() - inicio, ok=False,
+                                                 limitado=isinstance(e, PlaywrightTimeoutError))
                     if intento < INTENTOS_MAXIMOS:
-                        await asyncio.sleep(1.5) 
                         continue 
                     else:
-                        if page: await page.close()
-                        if context: await context.close()
+                        descartar = True
                         return 0, "Sin Marca", f"Err: {str(e)[:20]}"
-        except Exception as e:
-            return 0, "Sin Marca", f"Driver: {str(e)}"
+        finally:
+            await self.pool.devolver(entrada, descartar)
         return 0, "Sin Marca", "Unknown"